@@ -1,4 +1,4 @@
-from flask import Flask, request, g
+from flask import Flask, request, g, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
@@ -10,6 +10,8 @@ import os
 import uuid
 from time import time
 from functools import wraps
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from .models import db
 from .schemas import ma
@@ -117,9 +119,19 @@ def create_app(config_name='default'):
     app.register_blueprint(group_event_bp, url_prefix='/api/group-events')
     
     # Register error handlers
-    from .errors import register_error_handlers
+    from .errors import register_error_handlers, error_response
     register_error_handlers(app)
     
+    @app.route('/health', methods=['GET'])
+    def health():
+        """Liveness check that also confirms a pooled database connection works"""
+        try:
+            db.session.execute(text('SELECT 1'))
+        except SQLAlchemyError as e:
+            app.logger.error(f"Health check failed: {str(e)}")
+            return error_response(503, 'Database unavailable')
+        return jsonify({'status': 'ok'}), 200
+    
     # Create database tables
     with app.app_context():
         db.create_all()
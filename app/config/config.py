@@ -13,9 +13,15 @@ class Config:
         'pool_timeout': 30,  # Seconds to wait before giving up on getting a connection
         'pool_recycle': 1800,  # Recycle connections after 30 minutes
         'max_overflow': 2,  # Allow exceeding pool_size by up to 2 connections in high-load situations
+        'pool_pre_ping': True,  # Replace connections the server dropped instead of failing the request
+        'query_cache_size': 1200,  # Room for every compiled statement the services issue (default 500)
         'echo': False,  # Don't log all SQL statements in production
     }
     
+    # Password hashing; stored hashes record their own method, so changing this only
+    # affects newly set passwords
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    
     # Caching configuration
     CACHE_TYPE = 'simple'  # Use SimpleCache by default
     CACHE_DEFAULT_TIMEOUT = 300  # Cache timeout in seconds
@@ -51,9 +57,9 @@ class ProductionConfig(Config):
     # Production-specific SQLAlchemy optimizations
     SQLALCHEMY_ENGINE_OPTIONS = {
         **Config.SQLALCHEMY_ENGINE_OPTIONS,
-        'pool_size': 20,  # Larger connection pool for production
-        'max_overflow': 5,
-        'pool_pre_ping': True,  # Enable connection health checks
+        'pool_size': 25,  # Per worker process; keep at or above the gunicorn thread count
+        'max_overflow': 25,  # Burst headroom before requests wait pool_timeout
+        'executemany_mode': 'values_plus_batch',  # Batch psycopg2 executemany INSERT/UPDATEs
     }
     
     # Production security settings
@@ -46,21 +46,22 @@ def get_assignments():
         overdue_only = request.args.get('overdue_only', 'false').lower() == 'true'
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         if query:
             # Search assignments
             result = assignment_service.search_assignments(
-                query, course_id, include_past, page, per_page
+                query, course_id, include_past, page, per_page, count
             )
         elif upcoming_days:
             # Get upcoming assignments
             result = assignment_service.get_upcoming_assignments(
-                course_id, upcoming_days, page, per_page
+                course_id, upcoming_days, page, per_page, count
             )
         elif overdue_only:
             # Get overdue assignments
             result = assignment_service.get_overdue_assignments(
-                course_id, page, per_page
+                course_id, page, per_page, count
             )
         else:
             # Get all assignments (paginated)
@@ -71,7 +72,8 @@ def get_assignments():
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result.get('has_next')
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting assignments: {str(e)}")
@@ -171,10 +173,7 @@ def extend_due_date(assignment_id):
             return jsonify({'message': 'Unauthorized'}), 403
             
         data = request.get_json()
-        new_due_date = datetime.strptime(
-            data.get('new_due_date'),
-            '%Y-%m-%d %H:%M:%S'
-        )
+        new_due_date = datetime.fromisoformat(data.get('new_due_date'))
         
         updated_assignment = assignment_service.extend_due_date(
             assignment_id,
@@ -212,9 +211,10 @@ def get_upcoming():
         days = int(request.args.get('days', 7))
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         result = assignment_service.get_upcoming_assignments(
-            course_id, days, page, per_page
+            course_id, days, page, per_page, count
         )
         
         return jsonify({
@@ -222,7 +222,8 @@ def get_upcoming():
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result.get('has_next')
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting upcoming assignments: {str(e)}")
@@ -236,9 +237,10 @@ def get_overdue():
         course_id = request.args.get('course_id', type=int)
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         result = assignment_service.get_overdue_assignments(
-            course_id, page, per_page
+            course_id, page, per_page, count
         )
         
         return jsonify({
@@ -246,7 +248,8 @@ def get_overdue():
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result.get('has_next')
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting overdue assignments: {str(e)}")
@@ -11,10 +11,15 @@ from ..schemas.chat import (
     chat_create_schema,
     chat_participant_schema
 )
+from ..schemas.message import messages_list_schema
 from .user_controller import login_required
 
 chat_bp = Blueprint('chat', __name__)
 
+def _page_meta(result):
+    """Pagination fields of a service result (offset or cursor based)"""
+    return {k: v for k, v in result.items() if k != 'items'}
+
 @chat_bp.route('/', methods=['POST'])
 @login_required
 def create_chat():
@@ -42,23 +47,24 @@ def get_chats():
     """Get user's chats"""
     try:
         chat_type = request.args.get('type')
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
+        page = request.args.get('page', type=int)  # Legacy offset paging
         per_page = int(request.args.get('per_page', 10))
         
         result = chat_service.get_user_chats(
             g.current_user.user_id,
             chat_type,
-            page,
-            per_page
+            cursor,
+            per_page,
+            page
         )
         
         return jsonify({
             'chats': chats_list_schema.dump(result['items']),
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            **_page_meta(result)
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting chats: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -84,12 +90,12 @@ def get_chat(chat_id):
 
 @chat_bp.route('/<int:chat_id>/messages', methods=['GET'])
 @login_required
-def get_messages():
+def get_messages(chat_id):
     """Get chat messages"""
     try:
-        chat_id = request.args.get('chat_id', type=int)
         query = request.args.get('q')
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
+        page = request.args.get('page', type=int)  # Legacy offset paging
         per_page = int(request.args.get('per_page', 20))
         
         # Check if user is a participant
@@ -100,21 +106,19 @@ def get_messages():
         
         if query:
             result = chat_service.search_chat_messages(
-                chat_id, query, page, per_page
+                chat_id, query, cursor, per_page, page
             )
         else:
             result = chat_service.get_chat_messages(
-                chat_id, page, per_page
+                chat_id, cursor, per_page, page
             )
         
-        # Note: You'll need to import and use message_schema here
         return jsonify({
-            'messages': result['items'],
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            'messages': messages_list_schema.dump(result['items']),
+            **_page_meta(result)
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting chat messages: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -13,6 +13,10 @@ from .user_controller import login_required
 
 course_bp = Blueprint('course', __name__)
 
+def _page_meta(result):
+    """Pagination fields of a service result (offset or cursor based)"""
+    return {k: v for k, v in result.items() if k != 'items'}
+
 @course_bp.route('/', methods=['POST'])
 @login_required
 def create_course():
@@ -43,29 +47,30 @@ def get_courses():
         semester = request.args.get('semester')
         query = request.args.get('q')
         page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
         per_page = int(request.args.get('per_page', 10))
         active_only = request.args.get('active_only', 'false').lower() == 'true'
+        count = request.args.get('count', 'false').lower() == 'true'
         
         if query:
             # Search courses
-            result = course_service.search_courses(query, semester, page, per_page)
+            result = course_service.search_courses(query, semester, page, per_page, count)
         elif semester:
             # Get courses by semester
-            result = course_service.get_courses_by_semester(semester, page, per_page)
+            result = course_service.get_courses_by_semester(semester, cursor, per_page)
         elif active_only:
             # Get active courses
-            result = course_service.get_active_courses(page, per_page)
+            result = course_service.get_active_courses(cursor, per_page)
         else:
             # Get all courses (paginated)
             result = course_service.get_all(page, per_page)
         
         return jsonify({
             'courses': courses_list_schema.dump(result['items']),
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            **_page_meta(result)
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting courses: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -130,23 +135,22 @@ def get_professor_courses(professor_id):
     """Get courses taught by a specific professor"""
     try:
         semester = request.args.get('semester')
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
         per_page = int(request.args.get('per_page', 10))
         
         result = course_service.get_courses_by_professor(
             professor_id,
             semester,
-            page,
+            cursor,
             per_page
         )
         
         return jsonify({
             'courses': courses_list_schema.dump(result['items']),
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            **_page_meta(result)
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting professor courses: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -159,21 +163,20 @@ def get_course_assignments(course_id):
         include_past = request.args.get('include_past', 'false').lower() == 'true'
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         result = course_service.get_course_assignments(
             course_id,
             include_past,
             page,
-            per_page
+            per_page,
+            count
         )
         
         # Note: You'll need to import and use assignment_schema here
         return jsonify({
             'assignments': result['items'],
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            **_page_meta(result)
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting course assignments: {str(e)}")
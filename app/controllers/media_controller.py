@@ -24,7 +24,8 @@ def upload_media():
             media_url=request.json.get('media_url'),  # From file upload service
             file_size=data['file_size'],
             mime_type=data['mime_type'],
-            metadata=data.get('file_metadata')
+            metadata=data.get('file_metadata'),
+            file_hash=data.get('file_hash')
         )
         return jsonify(media_schema.dump(media)), 201
     except ValidationError as e:
@@ -45,6 +46,7 @@ def get_media():
         user_id = request.args.get('user_id', type=int)
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         if query:
             # Search media
@@ -53,14 +55,16 @@ def get_media():
                 media_type,
                 user_id,
                 page,
-                per_page
+                per_page,
+                count
             )
         elif media_type:
             # Get media by type
             result = media_service.get_media_by_type(
                 media_type,
                 page,
-                per_page
+                per_page,
+                count
             )
         else:
             # Get user's media
@@ -68,7 +72,8 @@ def get_media():
                 g.current_user.user_id,
                 media_type,
                 page,
-                per_page
+                per_page,
+                count
             )
         
         return jsonify({
@@ -76,7 +81,8 @@ def get_media():
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result['has_next']
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting media: {str(e)}")
@@ -138,22 +138,23 @@ def get_unread_count():
 def get_readers(message_id):
     """Get users who have read a message"""
     try:
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
         per_page = int(request.args.get('per_page', 20))
         
         result = message_service.get_message_readers(
             message_id,
-            page,
+            cursor,
             per_page
         )
         
         return jsonify({
             'readers': message_read_statuses_schema.dump(result['items']),
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result['has_next'],
+            'next_cursor': result['next_cursor']
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting message readers: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -78,13 +78,15 @@ def get_notifications():
         notification_type = request.args.get('type')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
+        count = request.args.get('count', 'false').lower() == 'true'
         
         result = notification_service.get_user_notifications(
             g.current_user.user_id,
             unread_only,
             notification_type,
             page,
-            per_page
+            per_page,
+            count
         )
         
         return jsonify({
@@ -92,7 +94,8 @@ def get_notifications():
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result['has_next']
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error getting notifications: {str(e)}")
@@ -11,6 +11,7 @@ from ..schemas.user import (
     users_profile_schema,
     user_login_schema
 )
+from ..schemas.notification import notifications_schema
 
 user_bp = Blueprint('user', __name__)
 
@@ -87,14 +88,16 @@ def search_users():
         query = request.args.get('q', '')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
+        count = request.args.get('count', 'false').lower() == 'true'
         
-        result = user_service.search_users(query, page, per_page)
+        result = user_service.search_users(query, page, per_page, count)
         return jsonify({
             'users': users_profile_schema.dump(result['items']),
             'total': result['total'],
             'page': result['page'],
             'pages': result['pages'],
-            'per_page': result['per_page']
+            'per_page': result['per_page'],
+            'has_next': result['has_next']
         }), 200
     except Exception as e:
         current_app.logger.error(f"Error searching users: {str(e)}")
@@ -147,23 +150,23 @@ def get_notifications():
     """Get user's notifications"""
     try:
         unread_only = request.args.get('unread_only', 'false').lower() == 'true'
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
         per_page = int(request.args.get('per_page', 10))
         
         result = user_service.get_user_notifications(
             g.current_user.user_id,
             unread_only,
-            page,
+            cursor,
             per_page
         )
-        # Note: You'll need to import and use notification_schema here
         return jsonify({
-            'notifications': result['items'],
-            'total': result['total'],
-            'page': result['page'],
-            'pages': result['pages'],
-            'per_page': result['per_page']
+            'notifications': notifications_schema.dump(result['items']),
+            'per_page': result['per_page'],
+            'has_next': result['has_next'],
+            'next_cursor': result['next_cursor']
         }), 200
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error getting notifications: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
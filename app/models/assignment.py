@@ -15,6 +15,20 @@ class Assignment(db.Model):
     created_on = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Trigram indexes so ILIKE '%term%' searches avoid a sequential scan
+        db.Index(
+            'ix_assignments_title_trgm', 'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_assignments_description_trgm', 'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f'<Assignment {self.title} for Course {self.course_id}>'
     
@@ -1,6 +1,13 @@
 from datetime import datetime
 from . import db
 
+# session.info key collecting (chat_id, user_id) membership changes; the message service
+# drops the matching participant and unread caches once the session commits
+MEMBERSHIP_CHANGES_KEY = 'chat_membership_changes'
+
+def _note_membership_change(chat_id, user_id):
+    db.session.info.setdefault(MEMBERSHIP_CHANGES_KEY, set()).add((chat_id, user_id))
+
 class ChatParticipant(db.Model):
     __tablename__ = 'chat_participants'
     
@@ -11,9 +18,14 @@ class ChatParticipant(db.Model):
     left_at = db.Column(db.DateTime)
     is_admin = db.Column(db.Boolean, default=False)
     
+    # Relationships
+    user = db.relationship('User', lazy=True)
+    
     # Ensure unique participants per chat
     __table_args__ = (
         db.UniqueConstraint('chat_id', 'user_id', name='unique_chat_participant'),
+        # Backs "chats this user is still in" lookups
+        db.Index('ix_chat_participants_user_active', 'user_id', 'left_at', 'chat_id'),
     )
 
 class Chat(db.Model):
@@ -54,6 +66,7 @@ class Chat(db.Model):
             is_admin=is_admin
         )
         db.session.add(participant)
+        _note_membership_change(self.chat_id, user_id)
         return participant
     
     def remove_participant(self, user_id):
@@ -64,5 +77,6 @@ class Chat(db.Model):
         ).first()
         if participant:
             participant.left_at = datetime.utcnow()
+            _note_membership_change(self.chat_id, user_id)
             return True
         return False
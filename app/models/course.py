@@ -12,6 +12,19 @@ class Course(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Seek indexes for the keyset-paginated course listings
+    __table_args__ = (
+        db.Index('ix_courses_professor_date', 'professor_id', 'date_and_year', 'course_id'),
+        db.Index('ix_courses_semester_name', 'semester', 'course_name', 'course_id'),
+        db.Index('ix_courses_date', 'date_and_year', 'course_id'),
+        # Trigram index so course search's ILIKE '%term%' avoids a sequential scan
+        db.Index(
+            'ix_courses_course_name_trgm', 'course_name',
+            postgresql_using='gin',
+            postgresql_ops={'course_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+    
     # Relationships
     assignments = db.relationship('Assignment', backref='course', lazy=True, cascade='all, delete-orphan')
 
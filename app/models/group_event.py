@@ -12,6 +12,12 @@ class EventType:
     DESCRIPTION_CHANGE = 'description_change'
     SETTINGS_CHANGE = 'settings_change'
 
+# Every EventType value, built once for membership tests and iteration
+EVENT_TYPES = frozenset(
+    value for name, value in vars(EventType).items()
+    if not name.startswith('_')
+)
+
 class GroupEvent(db.Model):
     __tablename__ = 'group_events'
     
@@ -23,6 +29,13 @@ class GroupEvent(db.Model):
     event_data = db.Column(db.JSON)  # Additional event-specific data
     event_time = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
+    # Event logs per chat, performer and target, optionally narrowed by type, newest first
+    __table_args__ = (
+        db.Index('ix_group_events_chat_type_time', 'chat_id', 'event_type', 'event_time'),
+        db.Index('ix_group_events_user_type_time', 'user_id', 'event_type', 'event_time'),
+        db.Index('ix_group_events_target_time', 'target_user_id', 'event_time'),
+    )
+    
     # Relationships
     performer = db.relationship('User', foreign_keys=[user_id], backref='performed_events')
     target = db.relationship('User', foreign_keys=[target_user_id], backref='targeted_events')
@@ -19,6 +19,41 @@ class Media(db.Model):
     is_deleted = db.Column(db.Boolean, default=False)
     deleted_at = db.Column(db.DateTime)
     
+    __table_args__ = (
+        # One live file per hash for each user; create_media upserts against it.
+        # Scoped to the owner because file_hash is client-supplied
+        db.Index(
+            'ix_media_user_file_hash_live', 'user_id', 'file_hash',
+            unique=True,
+            postgresql_where=db.text('is_deleted = false'),
+            sqlite_where=db.text('is_deleted = 0')
+        ),
+        # Per-user and per-type listings of live files, newest first
+        db.Index(
+            'ix_media_user_uploaded_live', 'user_id', 'uploaded_at',
+            postgresql_where=db.text('is_deleted = false'),
+            sqlite_where=db.text('is_deleted = 0')
+        ),
+        db.Index(
+            'ix_media_type_uploaded_live', 'media_type', 'uploaded_at',
+            postgresql_where=db.text('is_deleted = false'),
+            sqlite_where=db.text('is_deleted = 0')
+        ),
+        # Trigram indexes over live files for search_media's ILIKE '%term%'
+        db.Index(
+            'ix_media_file_name_trgm', 'file_name',
+            postgresql_using='gin',
+            postgresql_ops={'file_name': 'gin_trgm_ops'},
+            postgresql_where=db.text('is_deleted = false')
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_media_original_name_trgm', 'original_name',
+            postgresql_using='gin',
+            postgresql_ops={'original_name': 'gin_trgm_ops'},
+            postgresql_where=db.text('is_deleted = false')
+        ).ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f'<Media {self.file_name} ({self.media_type})>'
     
@@ -56,6 +91,6 @@ class Media(db.Model):
         self.last_accessed = datetime.utcnow()
     
     @staticmethod
-    def get_by_hash(file_hash):
-        """Find media by file hash to prevent duplicates"""
-        return Media.query.filter_by(file_hash=file_hash, is_deleted=False).first()
+    def get_by_hash(user_id, file_hash):
+        """Find a user's media by file hash to prevent duplicates"""
+        return Media.query.filter_by(user_id=user_id, file_hash=file_hash, is_deleted=False).first()
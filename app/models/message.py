@@ -17,6 +17,28 @@ class Message(db.Model):
     reply_to = db.Column(db.Integer, db.ForeignKey('messages.message_id'))
     is_deleted = db.Column(db.Boolean, default=False)
     
+    __table_args__ = (
+        # Serves keyset pagination of a chat's history, newest first; partial
+        # so soft-deleted rows never sit between live ones in the index
+        db.Index(
+            'ix_messages_chat_sent_at_live', 'chat_id', 'sent_at', 'message_id',
+            postgresql_where=db.text('is_deleted = false'),
+            sqlite_where=db.text('is_deleted = 0')
+        ),
+        # Messages still awaiting delivery; shrinks as mark_as_delivered stamps them
+        db.Index(
+            'ix_messages_undelivered', 'message_id',
+            postgresql_where=db.text('delivered_at IS NULL'),
+            sqlite_where=db.text('delivered_at IS NULL')
+        ),
+        # Trigram index so chat search's ILIKE '%term%' avoids a sequential scan
+        db.Index(
+            'ix_messages_content_trgm', 'content',
+            postgresql_using='gin',
+            postgresql_ops={'content': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+    
     # Relationships
     notifications = db.relationship('Notification', backref='message', lazy=True)
     replies = db.relationship(
@@ -70,6 +92,8 @@ class MessageReadStatus(db.Model):
     # Ensure each user can only mark a message as read once
     __table_args__ = (
         db.UniqueConstraint('message_id', 'user_id', name='unique_message_read_status'),
+        # A message's readers in reading order, for keyset pagination
+        db.Index('ix_message_read_status_message_read_at', 'message_id', 'read_at', 'id'),
     )
 
     def __repr__(self):
@@ -8,6 +8,12 @@ class NotificationType:
     SYSTEM = 'system'
     GROUP = 'group'
 
+# Every NotificationType value, built once for membership tests and iteration
+NOTIFICATION_TYPES = frozenset(
+    value for name, value in vars(NotificationType).items()
+    if not name.startswith('_')
+)
+
 class Notification(db.Model):
     __tablename__ = 'notifications'
     
@@ -28,6 +34,13 @@ class Notification(db.Model):
     read_at = db.Column(db.DateTime)
     expires_at = db.Column(db.DateTime)  # Optional expiration time
     
+    __table_args__ = (
+        # A user's notifications, newest first
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at', 'notification_id'),
+        # Expiry sweeps in delete_expired_notifications
+        db.Index('ix_notifications_expires_at', 'expires_at'),
+    )
+    
     def __repr__(self):
         return f'<Notification {self.notification_id} for User {self.user_id}>'
     
@@ -12,19 +12,26 @@ class User(db.Model):
     status = db.Column(db.String(255))
     last_seen = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    performed_group_events = db.relationship('GroupEvent',
-        foreign_keys='GroupEvent.user_id',
-        backref=db.backref('performer', lazy='joined'),
-        lazy=True
-    )
     
-    targeted_group_events = db.relationship('GroupEvent',
-        foreign_keys='GroupEvent.target_user_id',
-        backref=db.backref('target', lazy='joined'),
-        lazy=True
+    # Trigram indexes so course and user search by name or email avoid a sequential scan
+    __table_args__ = (
+        db.Index(
+            'ix_users_first_name_trgm', 'first_name',
+            postgresql_using='gin',
+            postgresql_ops={'first_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_users_last_name_trgm', 'last_name',
+            postgresql_using='gin',
+            postgresql_ops={'last_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_users_email_trgm', 'email',
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
     )
-    
+
     # Relationships
     courses = db.relationship('Course', backref='professor', lazy=True)
     messages = db.relationship('Message', backref='sender', lazy=True)
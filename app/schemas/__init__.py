@@ -16,8 +16,9 @@ class BaseSchema(ma.SQLAlchemyAutoSchema):
     def validate_dates(self, data, **kwargs):
         """Validate date fields are not in the past for relevant fields"""
         date_fields = ['due_date', 'event_time']
+        now = datetime.utcnow()
         for field in date_fields:
-            if field in data and data[field] < datetime.utcnow():
+            if field in data and data[field] < now:
                 raise ValidationError(f"{field} cannot be in the past")
 
     def handle_error(self, error, data, **kwargs):
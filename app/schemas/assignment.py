@@ -1,7 +1,7 @@
 from marshmallow import fields, validates, ValidationError, validates_schema, pre_load
 from . import ma, BaseSchema
 from ..models.assignment import Assignment
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 class AssignmentSchema(BaseSchema):
     """Schema for Assignment model"""
@@ -69,12 +69,13 @@ class AssignmentSchema(BaseSchema):
         """Process date strings into datetime objects"""
         if 'due_date' in data and isinstance(data['due_date'], str):
             try:
-                data['due_date'] = datetime.strptime(
-                    data['due_date'],
-                    '%Y-%m-%d %H:%M:%S'
-                )
+                parsed = datetime.fromisoformat(data['due_date'])
             except ValueError:
                 raise ValidationError('Invalid date format. Use YYYY-MM-DD HH:MM:SS')
+            # Offsets are accepted; store and compare as naive UTC like the rest of the app
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            data['due_date'] = parsed
         return data
     
     @validates_schema
@@ -1,7 +1,7 @@
 from marshmallow import fields, validates, ValidationError, validates_schema, pre_load
 from . import ma, BaseSchema
 from ..models.course import Course
-from datetime import datetime
+from datetime import datetime, timezone
 
 class CourseSchema(BaseSchema):
     """Schema for Course model"""
@@ -35,7 +35,9 @@ class CourseSchema(BaseSchema):
     
     def get_active_assignments(self, obj):
         """Get number of active assignments"""
-        return len([a for a in obj.assignments if not a.is_overdue])
+        # Same test as Assignment.is_overdue, with one clock read per course
+        now = datetime.utcnow()
+        return sum(1 for a in obj.assignments if a.due_date >= now)
     
     @validates('course_name')
     def validate_course_name(self, value):
@@ -71,12 +73,13 @@ class CourseSchema(BaseSchema):
         """Process date strings into datetime objects"""
         if 'date_and_year' in data and isinstance(data['date_and_year'], str):
             try:
-                data['date_and_year'] = datetime.strptime(
-                    data['date_and_year'],
-                    '%Y-%m-%d %H:%M:%S'
-                )
+                parsed = datetime.fromisoformat(data['date_and_year'])
             except ValueError:
                 raise ValidationError('Invalid date format. Use YYYY-MM-DD HH:MM:SS')
+            # Offsets are accepted; store and compare as naive UTC like the rest of the app
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            data['date_and_year'] = parsed
         return data
     
     @validates_schema
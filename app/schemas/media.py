@@ -1,8 +1,13 @@
 from marshmallow import fields, validates, ValidationError, validates_schema
 from . import ma, BaseSchema
 from ..models.media import Media
+from urllib.parse import urlsplit
 import re
 
+_MIME_RE = re.compile(r'[a-z]+/[a-z0-9\-\+\.]+')
+_SHA256_RE = re.compile(r'[0-9a-f]{64}')
+_URL_SCHEMES = frozenset({'http', 'https'})
+
 class MediaSchema(BaseSchema):
     """Schema for Media model"""
     
@@ -59,8 +64,7 @@ class MediaSchema(BaseSchema):
     @validates('mime_type')
     def validate_mime_type(self, value):
         """Validate MIME type"""
-        mime_regex = r'^[a-z]+/[a-z0-9\-\+\.]+$'
-        if not re.match(mime_regex, value.lower()):
+        if not _MIME_RE.fullmatch(value.lower()):
             raise ValidationError('Invalid MIME type format')
     
     @validates('file_size')
@@ -77,8 +81,14 @@ class MediaSchema(BaseSchema):
     @validates('media_url')
     def validate_media_url(self, value):
         """Validate media URL"""
-        url_regex = r'^https?://[^\s/$.?#].[^\s]*$'
-        if not re.match(url_regex, value):
+        # urlsplit silently strips some whitespace, so reject it up front
+        if any(c.isspace() for c in value):
+            raise ValidationError('Invalid media URL format')
+        try:
+            parts = urlsplit(value)
+        except ValueError:
+            raise ValidationError('Invalid media URL format')
+        if parts.scheme not in _URL_SCHEMES or not parts.netloc:
             raise ValidationError('Invalid media URL format')
     
     @validates_schema
@@ -117,8 +127,15 @@ class MediaUploadSchema(ma.Schema):
     media_type = fields.String(required=True)
     mime_type = fields.String(required=True)
     file_size = fields.Integer(required=True)
+    file_hash = fields.String()  # SHA-256 of the content, from the file upload service
     file_metadata = fields.Dict()
     
+    @validates('file_hash')
+    def validate_file_hash(self, value):
+        """Validate content hash"""
+        if not _SHA256_RE.fullmatch(value):
+            raise ValidationError('File hash must be a lowercase hex SHA-256 digest')
+    
     @validates_schema
     def validate_upload(self, data, **kwargs):
         """Validate upload data"""
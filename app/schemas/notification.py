@@ -1,8 +1,17 @@
 from marshmallow import fields, validates, ValidationError, validates_schema
 from . import ma, BaseSchema
-from ..models.notification import Notification, NotificationType
+from ..models.notification import Notification, NotificationType, NOTIFICATION_TYPES
 from datetime import datetime, timedelta
 
+_NOTIFICATION_TYPE_ORDER = (
+    NotificationType.ASSIGNMENT,
+    NotificationType.MESSAGE,
+    NotificationType.COURSE,
+    NotificationType.SYSTEM,
+    NotificationType.GROUP
+)
+_INVALID_TYPE_MESSAGE = f'Invalid notification type. Must be one of: {", ".join(_NOTIFICATION_TYPE_ORDER)}'
+
 class NotificationSchema(BaseSchema):
     """Schema for Notification model"""
     
@@ -47,15 +56,8 @@ class NotificationSchema(BaseSchema):
     @validates('notification_type')
     def validate_notification_type(self, value):
         """Validate notification type"""
-        valid_types = [
-            NotificationType.ASSIGNMENT,
-            NotificationType.MESSAGE,
-            NotificationType.COURSE,
-            NotificationType.SYSTEM,
-            NotificationType.GROUP
-        ]
-        if value not in valid_types:
-            raise ValidationError(f'Invalid notification type. Must be one of: {", ".join(valid_types)}')
+        if value not in NOTIFICATION_TYPES:
+            raise ValidationError(_INVALID_TYPE_MESSAGE)
     
     @validates('title')
     def validate_title(self, value):
@@ -76,11 +78,12 @@ class NotificationSchema(BaseSchema):
         """Validate notification data"""
         # Validate expiration date
         if 'expires_at' in data and data['expires_at']:
-            if data['expires_at'] < datetime.utcnow():
+            now = datetime.utcnow()
+            if data['expires_at'] < now:
                 raise ValidationError('Expiration date cannot be in the past')
             
             # Maximum expiration time is 30 days
-            max_expiry = datetime.utcnow() + timedelta(days=30)
+            max_expiry = now + timedelta(days=30)
             if data['expires_at'] > max_expiry:
                 raise ValidationError('Expiration date cannot be more than 30 days in the future')
         
@@ -135,13 +138,7 @@ class NotificationCreateSchema(ma.Schema):
             raise ValidationError('User does not exist')
         
         # Validate notification type
-        if data['notification_type'] not in [
-            NotificationType.ASSIGNMENT,
-            NotificationType.MESSAGE,
-            NotificationType.COURSE,
-            NotificationType.SYSTEM,
-            NotificationType.GROUP
-        ]:
+        if data['notification_type'] not in NOTIFICATION_TYPES:
             raise ValidationError('Invalid notification type')
 
 notification_create_schema = NotificationCreateSchema()
@@ -3,6 +3,47 @@ from . import ma, BaseSchema
 from ..models.user import User
 import re
 
+# Compiled once; no nested quantifiers, so matching stays linear on hostile input
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+')
+_PHONE_RE = re.compile(r'\+?1?\d{9,15}')
+
+def _is_valid_email(value):
+    """Check email format without a backtracking regex"""
+    if not _EMAIL_RE.fullmatch(value):
+        return False
+    host, dot, tld = value.partition('@')[2].rpartition('.')
+    return bool(host and dot) and len(tld) >= 2 and tld.isalpha()
+
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT, _HAS_SPECIAL = 1, 2, 4, 8
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+
+def _check_password(password):
+    """Return a bitmask of the character classes present, in one pass"""
+    flags = 0
+    for c in password:
+        if c.isupper():
+            flags |= _HAS_UPPER
+        elif c.islower():
+            flags |= _HAS_LOWER
+        elif c.isdigit():
+            flags |= _HAS_DIGIT
+        elif c in _PASSWORD_SPECIALS:
+            flags |= _HAS_SPECIAL
+        else:
+            continue
+        if flags == _HAS_ALL:
+            break
+    return flags
+
+def _check_name(value, label):
+    """Validate a person's name, stripping it only once"""
+    name = value.strip()
+    if len(name) < 2:
+        raise ValidationError(f'{label} must be at least 2 characters long')
+    if not name.isalpha():
+        raise ValidationError(f'{label} must contain only letters')
+
 class UserSchema(BaseSchema):
     """Schema for User model"""
     
@@ -24,8 +65,7 @@ class UserSchema(BaseSchema):
     @validates('email')
     def validate_email(self, value):
         """Validate email format"""
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_regex, value):
+        if not _is_valid_email(value):
             raise ValidationError('Invalid email format')
         
         # Check if email already exists
@@ -35,8 +75,7 @@ class UserSchema(BaseSchema):
     @validates('phone_number')
     def validate_phone(self, value):
         """Validate phone number format"""
-        phone_regex = r'^\+?1?\d{9,15}$'
-        if not re.match(phone_regex, value):
+        if not _PHONE_RE.fullmatch(value):
             raise ValidationError('Invalid phone number format')
         
         # Check if phone number already exists
@@ -46,18 +85,12 @@ class UserSchema(BaseSchema):
     @validates('first_name')
     def validate_first_name(self, value):
         """Validate first name"""
-        if len(value.strip()) < 2:
-            raise ValidationError('First name must be at least 2 characters long')
-        if not value.strip().isalpha():
-            raise ValidationError('First name must contain only letters')
+        _check_name(value, 'First name')
     
     @validates('last_name')
     def validate_last_name(self, value):
         """Validate last name"""
-        if len(value.strip()) < 2:
-            raise ValidationError('Last name must be at least 2 characters long')
-        if not value.strip().isalpha():
-            raise ValidationError('Last name must contain only letters')
+        _check_name(value, 'Last name')
     
     @validates_schema
     def validate_passwords(self, data, **kwargs):
@@ -68,13 +101,15 @@ class UserSchema(BaseSchema):
         password = data.get('password', '')
         if len(password) < 8:
             raise ValidationError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in password):
+        
+        flags = _check_password(password)
+        if not flags & _HAS_UPPER:
             raise ValidationError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in password):
+        if not flags & _HAS_LOWER:
             raise ValidationError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in password):
+        if not flags & _HAS_DIGIT:
             raise ValidationError('Password must contain at least one number')
-        if not any(c in '!@#$%^&*(),.?":{}|<>' for c in password):
+        if not flags & _HAS_SPECIAL:
             raise ValidationError('Password must contain at least one special character')
 
 # Initialize schema instances
@@ -10,6 +10,9 @@ from ..models.course import Course
 from ..models.notification import Notification, NotificationType
 from ..models import db
 
+# Display format for due dates in notification text
+_DATE_FMT = '%Y-%m-%d %H:%M'
+
 class AssignmentService(BaseService):
     """Service class for assignment-related operations"""
     
@@ -20,16 +23,13 @@ class AssignmentService(BaseService):
         """Create a new assignment and notify relevant users"""
         try:
             # Validate course exists
-            course = Course.query.get(data['course_id'])
+            course = self._lookup(Course, data['course_id'])
             if not course:
                 raise ValueError("Course does not exist")
             
             # Convert string date to datetime if needed
             if isinstance(data.get('due_date'), str):
-                data['due_date'] = datetime.strptime(
-                    data['due_date'],
-                    '%Y-%m-%d %H:%M:%S'
-                )
+                data['due_date'] = datetime.fromisoformat(data['due_date'])
             
             assignment = self.create(data)
             
@@ -38,7 +38,7 @@ class AssignmentService(BaseService):
                 user_id=course.professor_id,
                 notification_type=NotificationType.ASSIGNMENT,
                 title=f"New Assignment: {assignment.title}",
-                content=f"Due date: {assignment.due_date.strftime('%Y-%m-%d %H:%M')}",
+                content=f"Due date: {assignment.due_date.strftime(_DATE_FMT)}",
                 data={'assignment_id': assignment.assignment_id}
             )
             db.session.add(notification)
@@ -55,7 +55,8 @@ class AssignmentService(BaseService):
         course_id: Optional[int] = None,
         days: int = 7,
         page: int = 1,
-        per_page: int = 10
+        per_page: int = 10,
+        count: bool = False
     ) -> Dict:
         """Get upcoming assignments within specified days"""
         try:
@@ -72,21 +73,8 @@ class AssignmentService(BaseService):
             if course_id:
                 query = query.filter_by(course_id=course_id)
             
-            pagination = query.order_by(
-                Assignment.due_date.asc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(Assignment.due_date.asc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting upcoming assignments: {str(e)}")
             raise
@@ -95,7 +83,8 @@ class AssignmentService(BaseService):
         self,
         course_id: Optional[int] = None,
         page: int = 1,
-        per_page: int = 10
+        per_page: int = 10,
+        count: bool = False
     ) -> Dict:
         """Get overdue assignments"""
         try:
@@ -106,21 +95,8 @@ class AssignmentService(BaseService):
             if course_id:
                 query = query.filter_by(course_id=course_id)
             
-            pagination = query.order_by(
-                Assignment.due_date.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(Assignment.due_date.desc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting overdue assignments: {str(e)}")
             raise
@@ -158,8 +134,8 @@ class AssignmentService(BaseService):
                     notification_type=NotificationType.ASSIGNMENT,
                     title=f"Due Date Extended: {assignment.title}",
                     content=(
-                        f"Due date changed from {old_due_date.strftime('%Y-%m-%d %H:%M')} "
-                        f"to {new_due_date.strftime('%Y-%m-%d %H:%M')}"
+                        f"Due date changed from {old_due_date.strftime(_DATE_FMT)} "
+                        f"to {new_due_date.strftime(_DATE_FMT)}"
                     ),
                     data={'assignment_id': assignment_id}
                 )
@@ -179,7 +155,8 @@ class AssignmentService(BaseService):
         course_id: Optional[int] = None,
         include_past: bool = False,
         page: int = 1,
-        per_page: int = 10
+        per_page: int = 10,
+        count: bool = False
     ) -> Dict:
         """Search assignments by title or description"""
         try:
@@ -197,23 +174,12 @@ class AssignmentService(BaseService):
             if not include_past:
                 filters.append(Assignment.due_date > datetime.utcnow())
             
-            pagination = Assignment.query.filter(
+            search_query = Assignment.query.filter(
                 and_(*filters)
             ).order_by(
                 Assignment.due_date.asc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._paginate(search_query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error searching assignments: {str(e)}")
             raise
@@ -1,54 +1,235 @@
 from typing import Any, Dict, List, Optional, Type, TypeVar, Union, Tuple
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, and_, or_, delete, func, inspect, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, InvalidRequestError, SQLAlchemyError
 from sqlalchemy.orm import joinedload
-from flask import current_app
+from flask import current_app, g, has_app_context
 from ..models import db
 from .. import cache
+import base64
 import hashlib
 import json
+import math
 
 T = TypeVar('T')
 
 class BaseService:
     """Base service class with common CRUD operations"""
     
+    # Listing order for get_all; the primary key is always appended as a tiebreaker
+    default_order_by = None
+    
     def __init__(self, model: Type[T]):
         self.model = model
+        # Models name their primary keys differently (user_id, chat_id, ...)
+        mapper = inspect(model)
+        self.pk_name = mapper.get_property_by_column(mapper.primary_key[0]).key
         self.cache_prefix = model.__name__.lower()
+        self.cache_version_key = f"cache_version_{self.cache_prefix}"
         self.default_cache_timeout = 300  # 5 minutes default cache timeout
     
     def _get_cache_key(self, key_parts: Union[str, List[Any]]) -> str:
-        """Generate a cache key from parts"""
+        """Generate a cache key from parts, scoped to the model's current cache version"""
         if isinstance(key_parts, str):
             key_parts = [key_parts]
-        key_str = f"{self.cache_prefix}:" + ":".join(str(p) for p in key_parts)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        version = cache.get(self.cache_version_key) or 0
+        key_str = f"{self.cache_prefix}:v{version}:" + ":".join(str(p) for p in key_parts)
+        # Keep keys readable; only digest the rare oversized one
+        if len(key_str) > 200:
+            return f"{self.cache_prefix}:v{version}:" + hashlib.md5(key_str.encode()).hexdigest()
+        return key_str
+
+    def _invalidate_cache(self) -> None:
+        """Invalidate every cached entry for this model by bumping its version"""
+        # Entries under the old version are never read again and expire by TTL;
+        # inc() lives on the backend, Flask-Caching's Cache does not proxy it
+        cache.cache.inc(self.cache_version_key)
+        memo = self._request_memo()
+        if memo:
+            memo.pop(('exists', self.cache_prefix), None)
+
+    def _request_memo(self) -> Optional[Dict[Any, Any]]:
+        """Per-request lookup memo stored on flask.g (None outside an app context)"""
+        if not has_app_context():
+            return None
+        return g.setdefault('_service_memo', {})
 
-    def _invalidate_cache(self, key_parts: Union[str, List[Any]]) -> None:
-        """Invalidate a cache entry"""
-        cache.delete(self._get_cache_key(key_parts))
+    def _forget(self, ids: List[Any]) -> None:
+        """Drop records from the per-request memo"""
+        memo = self._request_memo()
+        if memo:
+            for id in ids:
+                memo.pop((self.cache_prefix, id), None)
+
+    def _lookup(self, model, id: Any):
+        """Get a record of any model by primary key, memoized for the rest of the request"""
+        # Shares get_by_id's memo entries, so services see one another's lookups
+        memo = self._request_memo()
+        memo_entry = None
+        if memo is not None:
+            memo_entry = memo.setdefault((model.__name__.lower(), id), {})
+            if str(None) in memo_entry:
+                return memo_entry[str(None)]
+        
+        result = db.session.get(model, id)
+        if result and memo_entry is not None:
+            memo_entry[str(None)] = result
+        return result
+
+    def _dialect_insert(self, model=None):
+        """INSERT construct supporting ON CONFLICT for the bound dialect, or None"""
+        model = model or self.model
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            return pg_insert(model)
+        if dialect == 'sqlite':
+            return sqlite_insert(model)
+        return None
+
+    def _insert_rows(self, model, rows: List[Dict[str, Any]], chunk_size: int = 1000) -> None:
+        """Insert plain rows as executemany INSERTs of at most chunk_size rows, without committing"""
+        for i in range(0, len(rows), chunk_size):
+            db.session.execute(insert(model), rows[i:i + chunk_size])
+
+    def _paginate(self, query, page: int, per_page: int, count: bool = False) -> Dict[str, Any]:
+        """Paginate a query, only counting matches when a total is requested"""
+        page = max(page, 1)
+        per_page = max(per_page, 1)
+        offset = (page - 1) * per_page
+        if count:
+            # COUNT(*) OVER () returns the total alongside the page in one round-trip
+            rows = query.add_columns(
+                func.count().over().label('total')
+            ).limit(per_page).offset(offset).all()
+            if rows:
+                total = rows[0].total
+            else:
+                # An empty page carries no window value; only count when past page 1
+                total = query.order_by(None).count() if page > 1 else 0
+            return {
+                'items': [row[0] for row in rows],
+                'total': total,
+                'page': page,
+                'pages': math.ceil(total / per_page) if per_page else 0,
+                'per_page': per_page,
+                'has_next': offset + per_page < total
+            }
+        
+        # Fetch one extra row to find out whether there is a next page
+        rows = query.limit(per_page + 1).offset(offset).all()
+        return {
+            'items': rows[:per_page],
+            'total': None,
+            'page': page,
+            'pages': None,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page
+        }
+
+    @staticmethod
+    def _encode_cursor(values: List[Any]) -> str:
+        """Encode keyset values as an opaque cursor token"""
+        payload = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> List[Any]:
+        """Decode a cursor token, raising ValueError if it is malformed"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(payload, list) or len(payload) != 2:
+                raise ValueError(cursor)
+            value, last_id = [
+                datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v
+                for v in payload
+            ]
+            # Only shapes _encode_cursor produces may reach the SQL comparison
+            if isinstance(last_id, bool) or not isinstance(last_id, int):
+                raise ValueError(cursor)
+            if not isinstance(value, (datetime, str, int, float, type(None))):
+                raise ValueError(cursor)
+            return [value, last_id]
+        except (ValueError, TypeError, KeyError):
+            raise ValueError("Invalid cursor")
+
+    def _keyset_paginate(
+        self,
+        query,
+        sort_col,
+        id_col,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        descending: bool = True,
+        nullable: bool = False,
+        page: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Paginate on (sort_col, id_col) so each page is an index seek instead of an OFFSET scan"""
+        # per_page comes straight from the query string; LIMIT needs at least one row
+        per_page = max(per_page, 1)
+        if descending:
+            order = [sort_col.desc(), id_col.desc()]
+        else:
+            order = [sort_col.asc(), id_col.asc()]
+        if nullable:
+            order[0] = order[0].nullslast()
+        
+        if page is not None and not cursor:
+            # Legacy ?page= clients: same order, OFFSET paging with total/pages
+            result = self._paginate(query.order_by(*order), page, per_page, count=True)
+            result['next_cursor'] = None
+            return result
+        
+        if cursor:
+            value, last_id = self._decode_cursor(cursor)
+            if descending:
+                after_value, after_id = sort_col < value, id_col < last_id
+            else:
+                after_value, after_id = sort_col > value, id_col > last_id
+            
+            if value is None:
+                # Already inside the trailing NULL block
+                query = query.filter(sort_col.is_(None), after_id)
+            else:
+                seek = [after_value, and_(sort_col == value, after_id)]
+                if nullable:
+                    seek.append(sort_col.is_(None))
+                query = query.filter(or_(*seek))
+        
+        rows = query.order_by(*order).limit(per_page + 1).all()
+        items = rows[:per_page]
+        has_next = len(rows) > per_page
+        next_cursor = None
+        if has_next and items:
+            last = items[-1]
+            next_cursor = self._encode_cursor([getattr(last, sort_col.key), getattr(last, id_col.key)])
+        
+        return {
+            'items': items,
+            'per_page': per_page,
+            'has_next': has_next,
+            'next_cursor': next_cursor
+        }
 
     def get_by_id(self, id: int, relations: Optional[List[str]] = None) -> Optional[T]:
         """Get a single record by ID with optional eager loading"""
-        cache_key = self._get_cache_key(['by_id', id, str(relations)])
+        # Repeat lookups within a request are served from the memo; instances are
+        # not put in the shared cache, where they would come back detached
+        memo = self._request_memo()
+        memo_entry = None
+        if memo is not None:
+            memo_entry = memo.setdefault((self.cache_prefix, id), {})
+            if str(relations) in memo_entry:
+                return memo_entry[str(relations)]
         
-        # Try to get from cache first
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-            
         try:
-            query = self.model.query
-            
             # Add eager loading if relations specified
-            if relations:
-                for relation in relations:
-                    query = query.options(joinedload(relation))
+            options = [joinedload(getattr(self.model, r)) for r in relations] if relations else None
             
-            result = query.get(id)
-            if result:
-                # Cache the result
-                cache.set(cache_key, result, timeout=self.default_cache_timeout)
+            result = db.session.get(self.model, id, options=options)
+            if result and memo_entry is not None:
+                memo_entry[str(relations)] = result
             return result
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error retrieving {self.model.__name__}: {str(e)}")
@@ -57,47 +238,36 @@ class BaseService:
     def get_all(self, page: int = 1, per_page: int = 10, relations: Optional[List[str]] = None) -> Dict[str, Any]:
         """Get all records with pagination and optional eager loading"""
         cache_key = self._get_cache_key(['all', page, per_page, str(relations)])
+        pk = getattr(self.model, self.pk_name)
         
-        # Try to get from cache first
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-            
         try:
             query = self.model.query
             
             # Add eager loading if relations specified
             if relations:
                 for relation in relations:
-                    query = query.options(joinedload(relation))
+                    query = query.options(joinedload(getattr(self.model, relation)))
             
-            # Add ordering by ID for consistent pagination
-            query = query.order_by(self.model.id)
+            # Only primary keys are cached; rehydrate the page from them
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                ids = cached_result['ids']
+                rows = query.filter(pk.in_(ids)).all() if ids else []
+                position = {id: i for i, id in enumerate(ids)}
+                rows.sort(key=lambda row: position[getattr(row, self.pk_name)])
+                result = {k: v for k, v in cached_result.items() if k != 'ids'}
+                result['items'] = rows
+                return result
             
-            pagination = query.paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            result = {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            # Primary key last keeps pagination stable under ties
+            order = [pk] if self.default_order_by is None else [self.default_order_by, pk]
+            result = self._paginate(query.order_by(*order), page, per_page, count=True)
             
             # Cache the result
-            cache.set(cache_key, result, timeout=self.default_cache_timeout)
+            cached = {k: v for k, v in result.items() if k != 'items'}
+            cached['ids'] = [getattr(row, self.pk_name) for row in result['items']]
+            cache.set(cache_key, cached, timeout=self.default_cache_timeout)
             return result
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error retrieving {self.model.__name__} list: {str(e)}")
             raise
@@ -110,7 +280,7 @@ class BaseService:
             db.session.commit()
             
             # Invalidate relevant caches
-            self._invalidate_cache('all')
+            self._invalidate_cache()
             
             return instance
         except SQLAlchemyError as e:
@@ -121,11 +291,22 @@ class BaseService:
     def update(self, id: int, data: Dict[str, Any]) -> Optional[T]:
         """Update an existing record"""
         try:
-            instance = self.get_by_id(id)
+            column_keys = {attr.key for attr in inspect(self.model).column_attrs}
+            if data and column_keys.issuperset(data):
+                # Plain column changes: one UPDATE ... RETURNING instead of SELECT then UPDATE
+                pk = getattr(self.model, self.pk_name)
+                instance = db.session.scalars(
+                    update(self.model).where(pk == id).values(**data).returning(self.model)
+                ).first()
+            else:
+                # Relationships or properties need the loaded instance
+                instance = self.get_by_id(id)
+                if instance:
+                    for key, value in data.items():
+                        setattr(instance, key, value)
             if instance:
-                for key, value in data.items():
-                    setattr(instance, key, value)
                 db.session.commit()
+                self._invalidate_cache()
             return instance
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -133,14 +314,35 @@ class BaseService:
             raise
     
     def delete(self, id: int) -> bool:
-        """Delete a record"""
+        """Delete a record
+
+        Models without delete cascades or before/after_delete listeners are removed with
+        a single DELETE by primary key, which does not fire ORM delete events; a loaded
+        instance of the row is dropped from the session by the statement's synchronization.
+        """
         try:
-            instance = self.get_by_id(id)
-            if instance:
+            mapper = inspect(self.model)
+            if (
+                any(rel.cascade.delete for rel in mapper.relationships)
+                or mapper.dispatch.before_delete
+                or mapper.dispatch.after_delete
+            ):
+                # ORM cascades (e.g. chat -> messages) and delete listeners only run
+                # through session.delete()
+                instance = self.get_by_id(id)
+                if not instance:
+                    return False
                 db.session.delete(instance)
-                db.session.commit()
-                return True
-            return False
+                deleted = True
+            else:
+                pk = getattr(self.model, self.pk_name)
+                deleted = db.session.execute(delete(self.model).where(pk == id)).rowcount > 0
+            
+            db.session.commit()
+            if deleted:
+                self._forget([id])
+                self._invalidate_cache()
+            return deleted
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error deleting {self.model.__name__}: {str(e)}")
@@ -153,14 +355,17 @@ class BaseService:
             # Process in chunks to avoid memory issues
             for i in range(0, len(items), chunk_size):
                 chunk = items[i:i + chunk_size]
-                chunk_instances = [self.model(**item) for item in chunk]
-                db.session.bulk_save_objects(chunk_instances)
+                # Multi-row INSERT ... RETURNING hands back populated instances
+                chunk_instances = db.session.scalars(
+                    insert(self.model).returning(self.model),
+                    chunk
+                ).all()
                 instances.extend(chunk_instances)
                 
             db.session.commit()
             
             # Invalidate relevant caches
-            self._invalidate_cache('all')
+            self._invalidate_cache()
             
             return instances
         except SQLAlchemyError as e:
@@ -168,43 +373,27 @@ class BaseService:
             current_app.logger.error(f"Error bulk creating {self.model.__name__}: {str(e)}")
             raise
     
-    def bulk_update(self, items: List[Dict[str, Any]], chunk_size: int = 1000) -> List[T]:
-        """Update multiple records with chunking"""
+    def bulk_update(self, items: List[Dict[str, Any]], chunk_size: int = 1000) -> int:
+        """Update multiple records by primary key with one executemany UPDATE per chunk"""
         try:
-            instances = []
-            # Process in chunks
-            for i in range(0, len(items), chunk_size):
-                chunk = items[i:i + chunk_size]
-                chunk_instances = []
-                
-                # Get all IDs for this chunk
-                ids = [item['id'] for item in chunk if 'id' in item]
-                existing_instances = {
-                    instance.id: instance 
-                    for instance in self.model.query.filter(self.model.id.in_(ids))
-                }
-                
-                for item in chunk:
-                    if 'id' not in item:
-                        raise ValueError("Each item must have an 'id' field")
-                    instance = existing_instances.get(item['id'])
-                    if instance:
-                        for key, value in item.items():
-                            if key != 'id':
-                                setattr(instance, key, value)
-                        chunk_instances.append(instance)
-                
-                instances.extend(chunk_instances)
-                db.session.commit()
-                
-                # Invalidate caches for updated records
-                for item in chunk:
-                    self._invalidate_cache(['by_id', item['id']])
+            # Accept either 'id' or the model's own primary key name
+            rows = []
+            for item in items:
+                row = dict(item)
+                if 'id' in row and self.pk_name != 'id':
+                    row[self.pk_name] = row.pop('id')
+                if self.pk_name not in row:
+                    raise ValueError("Each item must have an 'id' field")
+                rows.append(row)
             
-            # Invalidate general caches
-            self._invalidate_cache('all')
+            # All chunks share one transaction
+            for i in range(0, len(rows), chunk_size):
+                db.session.execute(update(self.model), rows[i:i + chunk_size])
+            db.session.commit()
+            self._forget([row[self.pk_name] for row in rows])
+            self._invalidate_cache()
             
-            return instances
+            return len(rows)
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error bulk updating {self.model.__name__}: {str(e)}")
@@ -213,8 +402,11 @@ class BaseService:
     def bulk_delete(self, ids: List[int]) -> bool:
         """Delete multiple records"""
         try:
-            result = self.model.query.filter(self.model.id.in_(ids)).delete(synchronize_session=False)
+            pk = getattr(self.model, self.pk_name)
+            result = self.model.query.filter(pk.in_(ids)).delete(synchronize_session=False)
             db.session.commit()
+            self._forget(ids)
+            self._invalidate_cache()
             return bool(result)
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -223,20 +415,38 @@ class BaseService:
     
     def exists(self, **kwargs) -> bool:
         """Check if a record exists with given criteria (with caching)"""
-        cache_key = self._get_cache_key(['exists', json.dumps(kwargs, sort_keys=True)])
+        criteria = tuple(sorted(kwargs.items()))
+        
+        # Authorization checks repeat the same lookup within a request
+        memo = self._request_memo()
+        memo_entry = None
+        if memo is not None:
+            try:
+                memo_entry = memo.setdefault(('exists', self.cache_prefix), {})
+                if criteria in memo_entry:
+                    return memo_entry[criteria]
+            except TypeError:
+                memo_entry = None  # unhashable filter value, e.g. a list
+        
+        # repr() quotes strings and keeps types apart, so distinct criteria never share a key
+        cache_key = self._get_cache_key(['exists', repr(criteria)])
         
         # Try to get from cache first
         cached_result = cache.get(cache_key)
         if cached_result is not None:
+            if memo_entry is not None:
+                memo_entry[criteria] = cached_result
             return cached_result
             
         try:
-            result = db.session.query(
-                db.session.query(self.model).filter_by(**kwargs).exists()
-            ).scalar()
+            # Project only the primary key and stop at the first match
+            pk = getattr(self.model, self.pk_name)
+            result = db.session.query(pk).filter_by(**kwargs).first() is not None
             
             # Cache the result
             cache.set(cache_key, result, timeout=self.default_cache_timeout)
+            if memo_entry is not None:
+                memo_entry[criteria] = result
             return result
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error checking existence of {self.model.__name__}: {str(e)}")
@@ -250,6 +460,25 @@ class BaseService:
             current_app.logger.error(f"Error counting {self.model.__name__}: {str(e)}")
             raise
     
+    def _unique_target(self, keys) -> Optional[List[str]]:
+        """Column names of a full unique constraint or index over exactly these attributes"""
+        mapper = inspect(self.model)
+        try:
+            names = {mapper.get_property(key).columns[0].name for key in keys}
+        except (AttributeError, InvalidRequestError):
+            return None
+        table = self.model.__table__
+        candidates = [c.columns for c in table.constraints if isinstance(c, (PrimaryKeyConstraint, UniqueConstraint))]
+        candidates += [
+            i.columns for i in table.indexes
+            if i.unique and not i.dialect_kwargs.get('postgresql_where')
+            and not i.dialect_kwargs.get('sqlite_where')
+        ]
+        for columns in candidates:
+            if {c.name for c in columns} == names:
+                return [c.name for c in columns]
+        return None
+
     def get_or_create(self, defaults: Optional[Dict[str, Any]] = None, **kwargs) -> Tuple[T, bool]:
         """Get an existing record or create a new one"""
         try:
@@ -260,8 +489,31 @@ class BaseService:
             params = dict(kwargs)
             if defaults:
                 params.update(defaults)
-            instance = self.create(params)
+            
+            stmt = self._dialect_insert()
+            if stmt is None:
+                return self.create(params), True
+            
+            # A concurrent insert of the same lookup key is skipped rather than raised; target
+            # its constraint when there is one so other unique violations still surface
+            target = self._unique_target(kwargs)
+            stmt = stmt.values(**params).on_conflict_do_nothing(index_elements=target)
+            instance = db.session.scalars(stmt.returning(self.model)).first()
+            db.session.commit()
+            if instance is None:
+                # Lost the race: the other request's row is now visible
+                instance = self.model.query.filter_by(**kwargs).first()
+                if instance is None:
+                    # The skipped conflict was on some other unique column
+                    raise IntegrityError(
+                        str(stmt), params,
+                        Exception(f"{self.model.__name__} conflicts with an existing row")
+                    )
+                return instance, False
+            
+            self._invalidate_cache()
             return instance, True
         except SQLAlchemyError as e:
+            db.session.rollback()
             current_app.logger.error(f"Error in get_or_create for {self.model.__name__}: {str(e)}")
             raise
@@ -3,8 +3,10 @@ from datetime import datetime
 from sqlalchemy import and_, or_
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 
 from .base_service import BaseService
+from .message_service import forget_active_participants, forget_unread_counts
 from ..models.chat import Chat, ChatParticipant
 from ..models.user import User
 from ..models.message import Message
@@ -14,6 +16,8 @@ from ..models import db
 class ChatService(BaseService):
     """Service class for chat-related operations"""
     
+    default_order_by = Chat.last_message_at.desc().nullslast()
+    
     def __init__(self):
         super().__init__(Chat)
     
@@ -30,6 +34,9 @@ class ChatService(BaseService):
             if chat_type not in ['private', 'group', 'course']:
                 raise ValueError("Invalid chat type")
             
+            # Drop duplicates (keeping order) so the unique constraint can't trip
+            participant_ids = list(dict.fromkeys(participant_ids))
+            
             # For private chats, ensure exactly 2 participants
             if chat_type == 'private' and len(participant_ids) != 2:
                 raise ValueError("Private chats must have exactly 2 participants")
@@ -44,16 +51,21 @@ class ChatService(BaseService):
                 'chat_name': chat_name
             })
             
-            # Add participants
-            for user_id in participant_ids:
-                participant = ChatParticipant(
-                    chat_id=chat.chat_id,
-                    user_id=user_id,
-                    is_admin=user_id == creator_id
-                )
-                db.session.add(participant)
+            # Add participants with chunked executemany INSERTs
+            self._insert_rows(
+                ChatParticipant,
+                [
+                    {
+                        'chat_id': chat.chat_id,
+                        'user_id': user_id,
+                        'is_admin': user_id == creator_id
+                    }
+                    for user_id in participant_ids
+                ]
+            )
             
             db.session.commit()
+            forget_active_participants(chat.chat_id)
             return chat
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -76,25 +88,33 @@ class ChatService(BaseService):
             existing_ids = {p.user_id for p in chat.participants if not p.left_at}
             new_ids = set(user_ids) - existing_ids
             
-            # Add new participants
-            for user_id in new_ids:
-                participant = ChatParticipant(
-                    chat_id=chat_id,
-                    user_id=user_id
-                )
-                db.session.add(participant)
+            if new_ids:
+                added_by_name = self._lookup(User, added_by_id).full_name
                 
-                # Create notification for new participant
-                notification = Notification(
-                    user_id=user_id,
-                    notification_type=NotificationType.GROUP,
-                    title=f"Added to chat: {chat.chat_name}",
-                    content=f"You were added by {User.query.get(added_by_id).full_name}",
-                    data={'chat_id': chat_id}
+                # Insert participants and their notifications in one batch each
+                self._insert_rows(
+                    ChatParticipant,
+                    [{'chat_id': chat_id, 'user_id': user_id} for user_id in new_ids]
+                )
+                self._insert_rows(
+                    Notification,
+                    [
+                        {
+                            'user_id': user_id,
+                            'notification_type': NotificationType.GROUP,
+                            'title': f"Added to chat: {chat.chat_name}",
+                            'content': f"You were added by {added_by_name}",
+                            'data': {'chat_id': chat_id}
+                        }
+                        for user_id in new_ids
+                    ]
                 )
-                db.session.add(notification)
             
             db.session.commit()
+            if new_ids:
+                forget_active_participants(chat_id)
+            # The chat's history now counts towards their unread totals
+            forget_unread_counts(new_ids)
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -123,12 +143,14 @@ class ChatService(BaseService):
                     user_id=user_id,
                     notification_type=NotificationType.GROUP,
                     title=f"Removed from chat",
-                    content=f"You were removed by {User.query.get(removed_by_id).full_name}",
+                    content=f"You were removed by {self._lookup(User, removed_by_id).full_name}",
                     data={'chat_id': chat_id}
                 )
                 db.session.add(notification)
                 
                 db.session.commit()
+                forget_active_participants(chat_id)
+                forget_unread_counts([user_id])
                 return True
             return False
         except SQLAlchemyError as e:
@@ -139,29 +161,20 @@ class ChatService(BaseService):
     def get_chat_messages(
         self,
         chat_id: int,
-        page: int = 1,
-        per_page: int = 20
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        page: Optional[int] = None
     ) -> Dict:
-        """Get messages for a chat with pagination"""
+        """Get messages for a chat, newest first, with cursor pagination"""
         try:
-            pagination = Message.query.filter_by(
+            query = Message.query.filter_by(
                 chat_id=chat_id,
                 is_deleted=False
-            ).order_by(
-                Message.sent_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._keyset_paginate(
+                query, Message.sent_at, Message.message_id, cursor, per_page,
+                page=page
+            )
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting chat messages: {str(e)}")
             raise
@@ -170,36 +183,31 @@ class ChatService(BaseService):
         self,
         user_id: int,
         chat_type: Optional[str] = None,
-        page: int = 1,
-        per_page: int = 10
+        cursor: Optional[str] = None,
+        per_page: int = 10,
+        page: Optional[int] = None
     ) -> Dict:
         """Get all chats for a user"""
         try:
-            query = Chat.query.join(
-                ChatParticipant
-            ).filter(
+            # Membership as a semi-join: one probe per chat, no duplicate rows
+            is_member = db.session.query(ChatParticipant).filter(
+                ChatParticipant.chat_id == Chat.chat_id,
                 ChatParticipant.user_id == user_id,
                 ChatParticipant.left_at.is_(None)
-            )
+            ).exists()
+            # Participants (and their users) are read by the list serializer;
+            # load them for the whole page in one extra query
+            query = Chat.query.options(
+                selectinload(Chat.participants).joinedload(ChatParticipant.user)
+            ).filter(is_member)
             
             if chat_type:
                 query = query.filter(Chat.chat_type == chat_type)
             
-            pagination = query.order_by(
-                Chat.last_message_at.desc().nullslast()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            return self._keyset_paginate(
+                query, Chat.last_message_at, Chat.chat_id, cursor, per_page,
+                nullable=True, page=page
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting user chats: {str(e)}")
             raise
@@ -208,33 +216,24 @@ class ChatService(BaseService):
         self,
         chat_id: int,
         query: str,
-        page: int = 1,
-        per_page: int = 20
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        page: Optional[int] = None
     ) -> Dict:
         """Search messages in a chat"""
         try:
             search = f"%{query}%"
-            pagination = Message.query.filter(
+            search_query = Message.query.filter(
                 and_(
                     Message.chat_id == chat_id,
                     Message.content.ilike(search),
                     Message.is_deleted == False
                 )
-            ).order_by(
-                Message.sent_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._keyset_paginate(
+                search_query, Message.sent_at, Message.message_id, cursor, per_page,
+                page=page
+            )
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error searching chat messages: {str(e)}")
             raise
@@ -254,16 +253,25 @@ class ChatService(BaseService):
                     chat.chat_name = settings['chat_name']
                 
                 # Create notification for all participants
-                for participant in chat.active_participants:
-                    if participant.user_id != updated_by_id:
-                        notification = Notification(
-                            user_id=participant.user_id,
-                            notification_type=NotificationType.GROUP,
-                            title=f"Chat settings updated",
-                            content=f"Settings updated by {User.query.get(updated_by_id).full_name}",
-                            data={'chat_id': chat_id}
-                        )
-                        db.session.add(notification)
+                recipient_ids = [
+                    p.user_id for p in chat.active_participants
+                    if p.user_id != updated_by_id
+                ]
+                if recipient_ids:
+                    updated_by_name = self._lookup(User, updated_by_id).full_name
+                    self._insert_rows(
+                        Notification,
+                        [
+                            {
+                                'user_id': user_id,
+                                'notification_type': NotificationType.GROUP,
+                                'title': "Chat settings updated",
+                                'content': f"Settings updated by {updated_by_name}",
+                                'data': {'chat_id': chat_id}
+                            }
+                            for user_id in recipient_ids
+                        ]
+                    )
                 
                 db.session.commit()
                 return True
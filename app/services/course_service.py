@@ -1,8 +1,9 @@
 from typing import Dict, List, Optional
 from datetime import datetime
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, update
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
 
 from .base_service import BaseService
 from ..models.course import Course
@@ -16,20 +17,27 @@ class CourseService(BaseService):
     def __init__(self):
         super().__init__(Course)
     
+    @staticmethod
+    def _list_query():
+        """Course query with everything the list serializer reads loaded up front"""
+        return Course.query.options(
+            joinedload(Course.professor),
+            selectinload(Course.assignments)
+        )
+    
     def create_course(self, data: Dict) -> Course:
         """Create a new course"""
         try:
-            # Validate professor exists
-            professor = User.query.get(data['professor_id'])
-            if not professor:
+            # Validate professor exists without loading the row
+            professor_exists = db.session.query(
+                User.query.filter(User.user_id == data['professor_id']).exists()
+            ).scalar()
+            if not professor_exists:
                 raise ValueError("Professor does not exist")
             
             # Convert string date to datetime if needed
             if isinstance(data.get('date_and_year'), str):
-                data['date_and_year'] = datetime.strptime(
-                    data['date_and_year'],
-                    '%Y-%m-%d %H:%M:%S'
-                )
+                data['date_and_year'] = datetime.fromisoformat(data['date_and_year'])
             
             return self.create(data)
         except SQLAlchemyError as e:
@@ -50,30 +58,18 @@ class CourseService(BaseService):
         self,
         professor_id: int,
         semester: Optional[str] = None,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 10
     ) -> Dict:
-        """Get courses taught by a professor"""
+        """Get courses taught by a professor, newest first"""
         try:
-            query = Course.query.filter_by(professor_id=professor_id)
+            query = self._list_query().filter_by(professor_id=professor_id)
             if semester:
                 query = query.filter_by(semester=semester)
             
-            pagination = query.order_by(
-                Course.date_and_year.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            return self._keyset_paginate(
+                query, Course.date_and_year, Course.course_id, cursor, per_page
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting professor courses: {str(e)}")
             raise
@@ -83,7 +79,8 @@ class CourseService(BaseService):
         query: str,
         semester: Optional[str] = None,
         page: int = 1,
-        per_page: int = 10
+        per_page: int = 10,
+        count: bool = False
     ) -> Dict:
         """Search courses by name or professor"""
         try:
@@ -94,7 +91,7 @@ class CourseService(BaseService):
                 filters.append(Course.semester == semester)
             
             # Join with User to search by professor name
-            courses = Course.query.join(
+            courses = self._list_query().join(
                 User, Course.professor_id == User.user_id
             ).filter(
                 and_(
@@ -107,19 +104,7 @@ class CourseService(BaseService):
                 )
             )
             
-            pagination = courses.paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._paginate(courses, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error searching courses: {str(e)}")
             raise
@@ -129,7 +114,8 @@ class CourseService(BaseService):
         course_id: int,
         include_past: bool = False,
         page: int = 1,
-        per_page: int = 10
+        per_page: int = 10,
+        count: bool = False
     ) -> Dict:
         """Get assignments for a course"""
         try:
@@ -137,21 +123,8 @@ class CourseService(BaseService):
             if not include_past:
                 query = query.filter(Assignment.due_date > datetime.utcnow())
             
-            pagination = query.order_by(
-                Assignment.due_date.asc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(Assignment.due_date.asc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting course assignments: {str(e)}")
             raise
@@ -159,57 +132,32 @@ class CourseService(BaseService):
     def get_courses_by_semester(
         self,
         semester: str,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 10
     ) -> Dict:
-        """Get all courses for a specific semester"""
+        """Get all courses for a specific semester, by name"""
         try:
-            pagination = Course.query.filter_by(
-                semester=semester
-            ).order_by(
-                Course.course_name.asc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            query = self._list_query().filter_by(semester=semester)
+            return self._keyset_paginate(
+                query, Course.course_name, Course.course_id, cursor, per_page,
+                descending=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting semester courses: {str(e)}")
             raise
     
     def get_active_courses(
         self,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 10
     ) -> Dict:
         """Get all currently active courses"""
         try:
             current_date = datetime.utcnow()
-            pagination = Course.query.filter(
-                Course.date_and_year <= current_date
-            ).order_by(
-                Course.date_and_year.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            query = self._list_query().filter(Course.date_and_year <= current_date)
+            return self._keyset_paginate(
+                query, Course.date_and_year, Course.course_id, cursor, per_page
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting active courses: {str(e)}")
             raise
@@ -217,14 +165,23 @@ class CourseService(BaseService):
     def update_course_professor(self, course_id: int, new_professor_id: int) -> bool:
         """Update the professor for a course"""
         try:
-            course = self.get_by_id(course_id)
-            new_professor = User.query.get(new_professor_id)
+            professor_exists = db.session.query(
+                User.query.filter(User.user_id == new_professor_id).exists()
+            ).scalar()
+            if not professor_exists:
+                return False
+            
+            result = db.session.execute(
+                update(Course).where(
+                    Course.course_id == course_id
+                ).values(professor_id=new_professor_id)
+            )
+            db.session.commit()
             
-            if course and new_professor:
-                course.professor_id = new_professor_id
-                db.session.commit()
-                return True
-            return False
+            if result.rowcount == 0:
+                return False
+            self._invalidate_cache()
+            return True
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error updating course professor: {str(e)}")
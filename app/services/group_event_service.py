@@ -1,12 +1,13 @@
 from typing import Dict, List, Optional
-from datetime import datetime
-from sqlalchemy import and_, or_
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, case, func
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 
 from .base_service import BaseService
-from ..models.group_event import GroupEvent, EventType
-from ..models.chat import Chat, ChatParticipant
+from .message_service import active_participant_ids
+from ..models.group_event import GroupEvent, EventType, EVENT_TYPES
 from ..models.notification import Notification, NotificationType
 from ..models.user import User
 from ..models import db
@@ -28,21 +29,19 @@ class GroupEventService(BaseService):
         """Create a new group event"""
         try:
             # Validate event type
-            if event_type not in EventType.__dict__.values():
+            if event_type not in EVENT_TYPES:
                 raise ValueError("Invalid event type")
             
-            # Validate chat exists and user is a participant
-            chat = Chat.query.join(
-                ChatParticipant
-            ).filter(
-                Chat.chat_id == chat_id,
-                ChatParticipant.user_id == user_id,
-                ChatParticipant.left_at.is_(None)
-            ).first()
+            # Active member ids both validate the performer and address the notifications
+            member_ids = active_participant_ids(chat_id)
             
-            if not chat:
+            if user_id not in member_ids:
                 raise ValueError("Invalid chat or user")
             
+            # Look up the users once; the notification text needs their names
+            performer = self._lookup(User, user_id)
+            target_user = None
+            
             # For events requiring target user, validate target exists
             if event_type in [
                 EventType.ADD,
@@ -53,7 +52,7 @@ class GroupEventService(BaseService):
                 if not target_user_id:
                     raise ValueError("Target user required for this event type")
                 
-                target_user = User.query.get(target_user_id)
+                target_user = self._lookup(User, target_user_id)
                 if not target_user:
                     raise ValueError("Target user does not exist")
             
@@ -67,7 +66,7 @@ class GroupEventService(BaseService):
             })
             
             # Create notifications for relevant users
-            self._create_event_notifications(event, chat)
+            self._create_event_notifications(event, member_ids, performer, target_user)
             
             db.session.commit()
             return event
@@ -76,31 +75,49 @@ class GroupEventService(BaseService):
             current_app.logger.error(f"Error creating group event: {str(e)}")
             raise
     
-    def _create_event_notifications(self, event: GroupEvent, chat: Chat) -> None:
+    def _create_event_notifications(
+        self,
+        event: GroupEvent,
+        member_ids: List[int],
+        performer: User,
+        target: Optional[User] = None
+    ) -> None:
         """Create notifications for a group event"""
         notification_data = {
-            'chat_id': chat.chat_id,
+            'chat_id': event.chat_id,
             'event_id': event.event_id
         }
         
         # Get notification title and content based on event type
-        title, content = self._get_event_notification_content(event)
+        title, content = self._get_event_notification_content(event, performer, target)
         
-        # Create notifications for all active participants except the event performer
-        for participant in chat.active_participants:
-            if participant.user_id != event.user_id:
-                notification = Notification(
-                    user_id=participant.user_id,
-                    notification_type=NotificationType.GROUP,
-                    title=title,
-                    content=content,
-                    data=notification_data
-                )
-                db.session.add(notification)
+        # Notify all active participants except the event performer in one batch
+        recipient_ids = [
+            member_id for member_id in member_ids
+            if member_id != event.user_id
+        ]
+        if recipient_ids:
+            self._insert_rows(
+                Notification,
+                [
+                    {
+                        'user_id': user_id,
+                        'notification_type': NotificationType.GROUP,
+                        'title': title,
+                        'content': content,
+                        'data': notification_data
+                    }
+                    for user_id in recipient_ids
+                ]
+            )
     
-    def _get_event_notification_content(self, event: GroupEvent) -> tuple[str, str]:
+    def _get_event_notification_content(
+        self,
+        event: GroupEvent,
+        performer: User,
+        target: Optional[User] = None
+    ) -> tuple[str, str]:
         """Get notification title and content for an event"""
-        performer = User.query.get(event.user_id)
         performer_name = performer.full_name
         
         if event.event_type == EventType.JOIN:
@@ -114,7 +131,6 @@ class GroupEventService(BaseService):
                 f"{performer_name} left the group"
             )
         elif event.event_type in [EventType.ADD, EventType.REMOVE, EventType.PROMOTE, EventType.DEMOTE]:
-            target = User.query.get(event.target_user_id)
             target_name = target.full_name
             
             if event.event_type == EventType.ADD:
@@ -155,30 +171,21 @@ class GroupEventService(BaseService):
         chat_id: int,
         event_type: Optional[str] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Get events for a chat"""
         try:
-            query = GroupEvent.query.filter_by(chat_id=chat_id)
+            query = GroupEvent.query.options(
+                joinedload(GroupEvent.performer),
+                joinedload(GroupEvent.target)
+            ).filter_by(chat_id=chat_id)
             
             if event_type:
                 query = query.filter_by(event_type=event_type)
             
-            pagination = query.order_by(
-                GroupEvent.event_time.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(GroupEvent.event_time.desc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting chat events: {str(e)}")
             raise
@@ -189,33 +196,25 @@ class GroupEventService(BaseService):
         as_target: bool = False,
         event_type: Optional[str] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Get events performed by or targeting a user"""
         try:
+            query = GroupEvent.query.options(
+                joinedload(GroupEvent.performer),
+                joinedload(GroupEvent.target)
+            )
             if as_target:
-                query = GroupEvent.query.filter_by(target_user_id=user_id)
+                query = query.filter_by(target_user_id=user_id)
             else:
-                query = GroupEvent.query.filter_by(user_id=user_id)
+                query = query.filter_by(user_id=user_id)
             
             if event_type:
                 query = query.filter_by(event_type=event_type)
             
-            pagination = query.order_by(
-                GroupEvent.event_time.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(GroupEvent.event_time.desc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting user events: {str(e)}")
             raise
@@ -223,21 +222,23 @@ class GroupEventService(BaseService):
     def get_event_stats(self, chat_id: Optional[int] = None) -> Dict:
         """Get event statistics"""
         try:
-            stats = {}
-            query = GroupEvent.query
+            cutoff = datetime.utcnow() - timedelta(days=1)
+            query = db.session.query(
+                GroupEvent.event_type,
+                func.count(),
+                func.sum(case((GroupEvent.event_time > cutoff, 1), else_=0))
+            )
             
             if chat_id:
-                query = query.filter_by(chat_id=chat_id)
+                query = query.filter(GroupEvent.chat_id == chat_id)
             
-            for event_type in EventType.__dict__.values():
-                if not event_type.startswith('_'):
-                    type_query = query.filter_by(event_type=event_type)
-                    stats[event_type] = {
-                        'total': type_query.count(),
-                        'last_24h': type_query.filter(
-                            GroupEvent.event_time > datetime.utcnow() - timedelta(days=1)
-                        ).count()
-                    }
+            # One grouped query; types with no events still report zeros
+            stats = {
+                event_type: {'total': 0, 'last_24h': 0}
+                for event_type in EVENT_TYPES
+            }
+            for event_type, total, last_24h in query.group_by(GroupEvent.event_type):
+                stats[event_type] = {'total': total, 'last_24h': last_24h or 0}
             
             return stats
         except SQLAlchemyError as e:
@@ -2,13 +2,14 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import hashlib
 import mimetypes
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, update
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
 
 from .base_service import BaseService
 from ..models.media import Media
 from ..models import db
+from .. import cache
 
 class MediaService(BaseService):
     """Service class for media-related operations"""
@@ -45,6 +46,16 @@ class MediaService(BaseService):
             'document': 20 * 1024 * 1024,  # 20MB
             'audio': 50 * 1024 * 1024  # 50MB
         }
+        
+        # Record last_accessed at most once per file in this many seconds
+        self.access_update_interval = 60
+        
+        # Reverse lookup: mime type -> (media type, max size)
+        self._mime_to_type = {
+            mime: (media_type, self.max_file_sizes[media_type])
+            for media_type, mimes in self.allowed_mime_types.items()
+            for mime in mimes
+        }
     
     def create_media(
         self,
@@ -53,39 +64,28 @@ class MediaService(BaseService):
         media_url: str,
         file_size: int,
         mime_type: str,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        file_hash: Optional[str] = None
     ) -> Media:
         """Create a new media record"""
         try:
             # Determine media type from mime type
-            media_type = next(
-                (k for k, v in self.allowed_mime_types.items() if mime_type in v),
-                None
-            )
-            if not media_type:
+            if mime_type not in self._mime_to_type:
                 raise ValueError(f"Unsupported mime type: {mime_type}")
+            media_type, max_size = self._mime_to_type[mime_type]
             
             # Validate file size
-            max_size = self.max_file_sizes.get(media_type)
             if file_size > max_size:
                 raise ValueError(
                     f"File size exceeds maximum allowed size for {media_type}"
                 )
             
-            # Generate file hash
-            hash_input = f"{media_url}{file_size}{datetime.utcnow().timestamp()}"
-            file_hash = hashlib.sha256(hash_input.encode()).hexdigest()
+            # Prefer the content hash; otherwise identify the stored object by URL and size
+            if not file_hash:
+                hash_input = f"{media_url}:{file_size}"
+                file_hash = hashlib.sha256(hash_input.encode()).hexdigest()
             
-            # Check for duplicate file
-            existing_media = Media.query.filter_by(
-                file_hash=file_hash,
-                is_deleted=False
-            ).first()
-            if existing_media:
-                return existing_media
-            
-            # Create media record
-            media = self.create({
+            row = {
                 'user_id': user_id,
                 'media_type': media_type,
                 'file_name': file_name,
@@ -95,8 +95,30 @@ class MediaService(BaseService):
                 'file_size': file_size,
                 'file_hash': file_hash,
                 'file_metadata': metadata or {}
-            })
+            }
             
+            stmt = self._dialect_insert()
+            if stmt is None:
+                existing_media = Media.query.filter_by(
+                    user_id=user_id,
+                    file_hash=file_hash,
+                    is_deleted=False
+                ).first()
+                return existing_media or self.create(row)
+            
+            # The user's own live file with the same hash is returned (and touched)
+            # instead of duplicated; other users' files never match
+            media = db.session.scalars(
+                stmt.values(**row).on_conflict_do_update(
+                    index_elements=['user_id', 'file_hash'],
+                    index_where=Media.is_deleted == False,
+                    set_={'last_accessed': func.now()}
+                ).returning(Media),
+                execution_options={'populate_existing': True}
+            ).one()
+            db.session.commit()
+            
+            self._invalidate_cache()
             return media
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -108,7 +130,8 @@ class MediaService(BaseService):
         user_id: int,
         media_type: Optional[str] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Get media files uploaded by a user"""
         try:
@@ -120,21 +143,8 @@ class MediaService(BaseService):
             if media_type:
                 query = query.filter_by(media_type=media_type)
             
-            pagination = query.order_by(
-                Media.uploaded_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            query = query.order_by(Media.uploaded_at.desc())
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting user media: {str(e)}")
             raise
@@ -145,7 +155,8 @@ class MediaService(BaseService):
         media_type: Optional[str] = None,
         user_id: Optional[int] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Search media files"""
         try:
@@ -163,23 +174,12 @@ class MediaService(BaseService):
             if user_id:
                 filters.append(Media.user_id == user_id)
             
-            pagination = Media.query.filter(
+            search_query = Media.query.filter(
                 and_(*filters)
             ).order_by(
                 Media.uploaded_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._paginate(search_query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error searching media: {str(e)}")
             raise
@@ -187,27 +187,50 @@ class MediaService(BaseService):
     def soft_delete_media(self, media_id: int, user_id: int) -> bool:
         """Soft delete a media file"""
         try:
-            media = self.get_by_id(media_id)
-            if media and media.user_id == user_id and not media.is_deleted:
-                media.is_deleted = True
-                media.deleted_at = datetime.utcnow()
-                db.session.commit()
-                return True
-            return False
+            # Ownership and liveness are checked by the UPDATE itself
+            result = db.session.execute(
+                update(Media).where(
+                    Media.media_id == media_id,
+                    Media.user_id == user_id,
+                    Media.is_deleted == False
+                ).values(is_deleted=True, deleted_at=datetime.utcnow())
+            )
+            db.session.commit()
+            
+            if result.rowcount == 0:
+                return False
+            self._invalidate_cache()
+            cache.delete(self._touch_key(media_id))
+            return True
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error deleting media: {str(e)}")
             raise
     
+    def _touch_key(self, media_id: int) -> str:
+        """Cache key marking a live media file as recently touched"""
+        return f"{self.cache_prefix}:touched:{media_id}"
+    
     def update_media_access(self, media_id: int) -> bool:
-        """Update last accessed timestamp"""
+        """Update last accessed timestamp; False if there is no live media with this id"""
         try:
-            media = self.get_by_id(media_id)
-            if media and not media.is_deleted:
-                media.last_accessed = datetime.utcnow()
-                db.session.commit()
+            # Views within the interval share the first one's write; the key is only
+            # set once a live row was touched, so unknown ids keep returning False
+            touch_key = self._touch_key(media_id)
+            if cache.get(touch_key):
                 return True
-            return False
+            
+            result = db.session.execute(
+                update(Media).where(
+                    Media.media_id == media_id,
+                    Media.is_deleted == False
+                ).values(last_accessed=datetime.utcnow())
+            )
+            db.session.commit()
+            if result.rowcount == 0:
+                return False
+            cache.set(touch_key, True, timeout=self.access_update_interval)
+            return True
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error updating media access: {str(e)}")
@@ -217,28 +240,18 @@ class MediaService(BaseService):
         self,
         media_type: str,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Get media files by type"""
         try:
-            pagination = Media.query.filter_by(
+            query = Media.query.filter_by(
                 media_type=media_type,
                 is_deleted=False
             ).order_by(
                 Media.uploaded_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting media by type: {str(e)}")
             raise
@@ -246,22 +259,22 @@ class MediaService(BaseService):
     def get_media_stats(self, user_id: Optional[int] = None) -> Dict:
         """Get media usage statistics"""
         try:
-            query = Media.query.filter_by(is_deleted=False)
+            query = db.session.query(
+                Media.media_type,
+                func.count(),
+                func.coalesce(func.sum(Media.file_size), 0)
+            ).filter(Media.is_deleted == False)
             if user_id:
-                query = query.filter_by(user_id=user_id)
+                query = query.filter(Media.user_id == user_id)
             
-            stats = {}
-            for media_type in self.allowed_mime_types.keys():
-                type_query = query.filter_by(media_type=media_type)
-                stats[media_type] = {
-                    'count': type_query.count(),
-                    'total_size': db.session.query(
-                        db.func.sum(Media.file_size)
-                    ).filter(
-                        Media.media_type == media_type,
-                        Media.is_deleted == False
-                    ).scalar() or 0
-                }
+            # One grouped query; types with no files still report zeros
+            stats = {
+                media_type: {'count': 0, 'total_size': 0}
+                for media_type in self.allowed_mime_types.keys()
+            }
+            for media_type, count, total_size in query.group_by(Media.media_type):
+                if media_type in stats:
+                    stats[media_type] = {'count': count, 'total_size': total_size}
             
             return stats
         except SQLAlchemyError as e:
@@ -1,14 +1,63 @@
 from typing import Dict, List, Optional
 from datetime import datetime
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, event, literal, select, update
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from .base_service import BaseService
 from ..models.message import Message, MessageReadStatus
-from ..models.chat import Chat, ChatParticipant
+from ..models.chat import Chat, ChatParticipant, MEMBERSHIP_CHANGES_KEY
 from ..models.notification import Notification, NotificationType
 from ..models import db
+from .. import cache
+
+# Per-user cache of unread message counts, keyed by chat id ('all' for every chat)
+_UNREAD_KEY = 'unread_messages:{}'
+_UNREAD_TIMEOUT = 60
+
+def forget_unread_counts(user_ids) -> None:
+    """Drop the cached unread message counts of these users"""
+    keys = [_UNREAD_KEY.format(user_id) for user_id in user_ids]
+    if keys:
+        cache.delete_many(*keys)
+
+# Active participant ids per chat, read on every send and dropped on join/leave
+_PARTICIPANTS_KEY = 'chat_participants:{}'
+_PARTICIPANTS_TIMEOUT = 60
+
+def active_participant_ids(chat_id: int) -> List[int]:
+    """User ids of a chat's active participants, cached briefly"""
+    key = _PARTICIPANTS_KEY.format(chat_id)
+    user_ids = cache.get(key)
+    if user_ids is None:
+        user_ids = db.session.scalars(
+            select(ChatParticipant.user_id).where(
+                ChatParticipant.chat_id == chat_id,
+                ChatParticipant.left_at.is_(None)
+            )
+        ).all()
+        cache.set(key, user_ids, timeout=_PARTICIPANTS_TIMEOUT)
+    return user_ids
+
+def forget_active_participants(chat_id: int) -> None:
+    """Drop the cached participant ids of a chat"""
+    cache.delete(_PARTICIPANTS_KEY.format(chat_id))
+
+def _forget_committed_membership(session) -> None:
+    """Drop caches for memberships changed through Chat.add/remove_participant"""
+    changes = session.info.pop(MEMBERSHIP_CHANGES_KEY, None)
+    if changes:
+        for chat_id in {chat_id for chat_id, _ in changes if chat_id is not None}:
+            forget_active_participants(chat_id)
+        forget_unread_counts({user_id for _, user_id in changes})
+
+def _discard_membership_changes(session) -> None:
+    """Rolled-back membership changes leave the caches valid"""
+    session.info.pop(MEMBERSHIP_CHANGES_KEY, None)
+
+event.listen(Session, 'after_commit', _forget_committed_membership)
+event.listen(Session, 'after_rollback', _discard_membership_changes)
 
 class MessageService(BaseService):
     """Service class for message-related operations"""
@@ -16,6 +65,21 @@ class MessageService(BaseService):
     def __init__(self):
         super().__init__(Message)
     
+    @staticmethod
+    def _unread_by(user_id: int):
+        """Messages from others that the user has no read status for"""
+        # LEFT JOIN ... IS NULL lets the planner pick a hash anti-join
+        return Message.query.outerjoin(
+            MessageReadStatus,
+            and_(
+                MessageReadStatus.message_id == Message.message_id,
+                MessageReadStatus.user_id == user_id
+            )
+        ).filter(
+            Message.sender_id != user_id,
+            MessageReadStatus.id.is_(None)
+        )
+    
     def send_message(
         self,
         chat_id: int,
@@ -27,18 +91,18 @@ class MessageService(BaseService):
     ) -> Message:
         """Send a new message in a chat"""
         try:
-            # Validate chat exists and sender is a participant
-            chat = Chat.query.join(
-                ChatParticipant
-            ).filter(
-                Chat.chat_id == chat_id,
-                ChatParticipant.user_id == sender_id,
-                ChatParticipant.left_at.is_(None)
-            ).first()
-            
-            if not chat:
+            # Validate the sender is an active participant; the same ids address the notifications
+            participant_ids = active_participant_ids(chat_id)
+            if sender_id not in participant_ids:
                 raise ValueError("Invalid chat or sender")
             
+            # Read what the notifications need before create() commits and expires the chat
+            recipient_ids = [
+                user_id for user_id in participant_ids
+                if user_id != sender_id
+            ]
+            title = f"New message in {self._lookup(Chat, chat_id).chat_name}"
+            
             # Create message
             message = self.create({
                 'chat_id': chat_id,
@@ -49,25 +113,39 @@ class MessageService(BaseService):
                 'reply_to': reply_to
             })
             
-            # Update chat's last message timestamp
-            chat.last_message_at = datetime.utcnow()
+            # Bump the chat's last message timestamp with a plain UPDATE; the chat
+            # instance was expired by create() and would otherwise be reloaded first
+            db.session.execute(
+                update(Chat).where(
+                    Chat.chat_id == chat_id
+                ).values(
+                    last_message_at=message.sent_at
+                ).execution_options(synchronize_session=False)
+            )
             
-            # Create notifications for other participants
-            for participant in chat.active_participants:
-                if participant.user_id != sender_id:
-                    notification = Notification(
-                        user_id=participant.user_id,
-                        notification_type=NotificationType.MESSAGE,
-                        title=f"New message in {chat.chat_name}",
-                        content=content[:100] if content else "New message",
-                        data={
-                            'chat_id': chat_id,
-                            'message_id': message.message_id
+            # Notify the other participants in one batch
+            if recipient_ids:
+                preview = content[:100] if content else "New message"
+                notification_data = {
+                    'chat_id': chat_id,
+                    'message_id': message.message_id
+                }
+                self._insert_rows(
+                    Notification,
+                    [
+                        {
+                            'user_id': user_id,
+                            'notification_type': NotificationType.MESSAGE,
+                            'title': title,
+                            'content': preview,
+                            'data': notification_data
                         }
-                    )
-                    db.session.add(notification)
+                        for user_id in recipient_ids
+                    ]
+                )
             
             db.session.commit()
+            forget_unread_counts(recipient_ids)
             return message
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -82,13 +160,21 @@ class MessageService(BaseService):
     ) -> Optional[Message]:
         """Edit an existing message"""
         try:
-            message = self.get_by_id(message_id)
-            if message and message.sender_id == user_id and not message.is_deleted:
-                message.content = new_content
-                message.edited_at = datetime.utcnow()
+            # Ownership and liveness are checked by the UPDATE itself
+            message = db.session.scalars(
+                update(Message).where(
+                    Message.message_id == message_id,
+                    Message.sender_id == user_id,
+                    Message.is_deleted == False
+                ).values(
+                    content=new_content,
+                    edited_at=datetime.utcnow()
+                ).returning(Message)
+            ).first()
+            if message:
                 db.session.commit()
-                return message
-            return None
+                self._invalidate_cache()
+            return message
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error editing message: {str(e)}")
@@ -97,12 +183,15 @@ class MessageService(BaseService):
     def delete_message(self, message_id: int, user_id: int) -> bool:
         """Soft delete a message"""
         try:
-            message = self.get_by_id(message_id)
-            if message and message.sender_id == user_id:
-                message.is_deleted = True
-                db.session.commit()
-                return True
-            return False
+            count = Message.query.filter(
+                Message.message_id == message_id,
+                Message.sender_id == user_id
+            ).update({'is_deleted': True})
+            
+            db.session.commit()
+            if count:
+                self._invalidate_cache()
+            return count > 0
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error deleting message: {str(e)}")
@@ -137,13 +226,35 @@ class MessageService(BaseService):
     ) -> int:
         """Mark multiple messages as read"""
         try:
-            # Get messages that haven't been read by this user
-            messages = Message.query.filter(
-                Message.message_id.in_(message_ids),
-                Message.sender_id != user_id,
-                ~Message.read_by.any(
-                    MessageReadStatus.user_id == user_id
+            stmt = self._dialect_insert(MessageReadStatus)
+            if stmt is not None:
+                # One INSERT ... SELECT; the unique (message_id, user_id) constraint
+                # skips messages already read, and RETURNING yields the new rows
+                unread = select(
+                    Message.message_id,
+                    literal(user_id),
+                    literal(datetime.utcnow())
+                ).where(
+                    Message.message_id.in_(message_ids),
+                    Message.sender_id != user_id
                 )
+                result = db.session.execute(
+                    stmt.from_select(
+                        ['message_id', 'user_id', 'read_at'],
+                        unread
+                    ).on_conflict_do_nothing(
+                        index_elements=['message_id', 'user_id']
+                    ).returning(MessageReadStatus.message_id)
+                )
+                marked = len(result.all())
+                db.session.commit()
+                if marked:
+                    forget_unread_counts([user_id])
+                return marked
+            
+            # Get messages that haven't been read by this user
+            messages = self._unread_by(user_id).filter(
+                Message.message_id.in_(message_ids)
             ).all()
             
             # Create read status for each message
@@ -155,6 +266,8 @@ class MessageService(BaseService):
                 db.session.add(read_status)
             
             db.session.commit()
+            if messages:
+                forget_unread_counts([user_id])
             return len(messages)
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -164,27 +277,31 @@ class MessageService(BaseService):
     def get_unread_count(self, user_id: int, chat_id: Optional[int] = None) -> int:
         """Get count of unread messages"""
         try:
-            query = Message.query.filter(
-                Message.sender_id != user_id,
-                ~Message.read_by.any(
-                    MessageReadStatus.user_id == user_id
-                )
-            )
+            # Counts stay cached until a send, read or membership change affects them
+            cache_key = _UNREAD_KEY.format(user_id)
+            counts = cache.get(cache_key) or {}
+            scope = chat_id or 'all'
+            if scope in counts:
+                return counts[scope]
+            
+            query = self._unread_by(user_id)
             
             if chat_id:
                 query = query.filter(Message.chat_id == chat_id)
             else:
                 # Only count messages from chats where user is still a participant
                 query = query.join(
-                    Chat
+                    Chat, Chat.chat_id == Message.chat_id
                 ).join(
-                    ChatParticipant
+                    ChatParticipant, ChatParticipant.chat_id == Chat.chat_id
                 ).filter(
                     ChatParticipant.user_id == user_id,
                     ChatParticipant.left_at.is_(None)
                 )
             
-            return query.count()
+            counts[scope] = query.count()
+            cache.set(cache_key, counts, timeout=_UNREAD_TIMEOUT)
+            return counts[scope]
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting unread count: {str(e)}")
             raise
@@ -192,28 +309,20 @@ class MessageService(BaseService):
     def get_message_readers(
         self,
         message_id: int,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 20
     ) -> Dict:
-        """Get users who have read a message"""
+        """Get users who have read a message, in reading order, with cursor pagination"""
         try:
-            pagination = MessageReadStatus.query.filter_by(
-                message_id=message_id
-            ).order_by(
-                MessageReadStatus.read_at.asc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            query = MessageReadStatus.query.filter_by(message_id=message_id)
+            return self._keyset_paginate(
+                query,
+                MessageReadStatus.read_at,
+                MessageReadStatus.id,
+                cursor,
+                per_page,
+                descending=False
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting message readers: {str(e)}")
             raise
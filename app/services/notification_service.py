@@ -1,11 +1,11 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, func, select
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
 
 from .base_service import BaseService
-from ..models.notification import Notification, NotificationType
+from ..models.notification import Notification, NOTIFICATION_TYPES
 from ..models.user import User
 from ..models import db
 
@@ -28,7 +28,7 @@ class NotificationService(BaseService):
         """Create a new notification"""
         try:
             # Validate notification type
-            if notification_type not in NotificationType.__dict__.values():
+            if notification_type not in NOTIFICATION_TYPES:
                 raise ValueError("Invalid notification type")
             
             # Validate priority range
@@ -61,7 +61,8 @@ class NotificationService(BaseService):
         unread_only: bool = False,
         notification_type: Optional[str] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        count: bool = False
     ) -> Dict:
         """Get notifications for a user"""
         try:
@@ -81,22 +82,12 @@ class NotificationService(BaseService):
             if notification_type:
                 query = query.filter_by(notification_type=notification_type)
             
-            pagination = query.order_by(
+            query = query.order_by(
                 Notification.priority.desc(),
-                Notification.created_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+                Notification.created_at.desc(),
+                Notification.notification_id.desc()
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            return self._paginate(query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting user notifications: {str(e)}")
             raise
@@ -123,15 +114,16 @@ class NotificationService(BaseService):
     def mark_as_read(self, notification_ids: List[int], user_id: int) -> int:
         """Mark multiple notifications as read"""
         try:
+            now = datetime.utcnow()
             count = Notification.query.filter(
                 Notification.notification_id.in_(notification_ids),
                 Notification.user_id == user_id,
                 Notification.read == False
             ).update({
                 'read': True,
-                'read_at': datetime.utcnow(),
+                'read_at': now,
                 'seen': True,
-                'seen_at': datetime.utcnow()
+                'seen_at': now
             }, synchronize_session=False)
             
             db.session.commit()
@@ -167,15 +159,24 @@ class NotificationService(BaseService):
             current_app.logger.error(f"Error getting unread count: {str(e)}")
             raise
     
-    def delete_expired_notifications(self) -> int:
-        """Delete expired notifications"""
+    def delete_expired_notifications(self, batch_size: int = 5000) -> int:
+        """Delete expired notifications in batches"""
         try:
-            count = Notification.query.filter(
-                Notification.expires_at <= datetime.utcnow()
-            ).delete(synchronize_session=False)
-            
-            db.session.commit()
-            return count
+            now = datetime.utcnow()
+            total = 0
+            while True:
+                # Short transactions keep locks and WAL bursts bounded on large sweeps
+                expired_ids = select(Notification.notification_id).where(
+                    Notification.expires_at <= now
+                ).limit(batch_size).scalar_subquery()
+                count = Notification.query.filter(
+                    Notification.notification_id.in_(expired_ids)
+                ).delete(synchronize_session=False)
+                
+                db.session.commit()
+                total += count
+                if count < batch_size:
+                    return total
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error deleting expired notifications: {str(e)}")
@@ -193,23 +194,19 @@ class NotificationService(BaseService):
     ) -> List[Notification]:
         """Create notifications for multiple users"""
         try:
-            notifications = []
-            for user_id in user_ids:
-                notification = Notification(
-                    user_id=user_id,
-                    notification_type=notification_type,
-                    title=title,
-                    content=content,
-                    data=data or {},
-                    priority=priority,
-                    expires_at=expires_at
-                )
-                notifications.append(notification)
-            
-            db.session.bulk_save_objects(notifications)
-            db.session.commit()
-            
-            return notifications
+            # INSERT ... RETURNING hands back persisted instances with their ids
+            return self.bulk_create([
+                {
+                    'user_id': user_id,
+                    'notification_type': notification_type,
+                    'title': title,
+                    'content': content,
+                    'data': data or {},
+                    'priority': priority,
+                    'expires_at': expires_at
+                }
+                for user_id in user_ids
+            ])
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error creating bulk notifications: {str(e)}")
@@ -218,18 +215,26 @@ class NotificationService(BaseService):
     def get_notification_stats(self, user_id: int) -> Dict:
         """Get notification statistics for a user"""
         try:
-            stats = {}
-            for notification_type in NotificationType.__dict__.values():
-                if not notification_type.startswith('_'):
-                    type_query = Notification.query.filter_by(
-                        user_id=user_id,
-                        notification_type=notification_type
-                    )
-                    stats[notification_type] = {
-                        'total': type_query.count(),
-                        'unread': type_query.filter_by(read=False).count(),
-                        'unseen': type_query.filter_by(seen=False).count()
-                    }
+            rows = db.session.query(
+                Notification.notification_type,
+                func.count(),
+                func.sum(case((Notification.read == False, 1), else_=0)),
+                func.sum(case((Notification.seen == False, 1), else_=0))
+            ).filter(
+                Notification.user_id == user_id
+            ).group_by(Notification.notification_type)
+            
+            # One grouped query; types with no notifications still report zeros
+            stats = {
+                notification_type: {'total': 0, 'unread': 0, 'unseen': 0}
+                for notification_type in NOTIFICATION_TYPES
+            }
+            for notification_type, total, unread, unseen in rows:
+                stats[notification_type] = {
+                    'total': total,
+                    'unread': unread or 0,
+                    'unseen': unseen or 0
+                }
             
             return stats
         except SQLAlchemyError as e:
@@ -4,23 +4,32 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import or_
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 
 from .base_service import BaseService
 from ..models.user import User
+from ..models.notification import Notification
 from ..models import db
+from .. import cache
 
 class UserService(BaseService):
     """Service class for user-related operations"""
     
     def __init__(self):
         super().__init__(User)
+        
+        # Record last_seen at most once per user in this many seconds
+        self.last_seen_interval = 60
     
     def create_user(self, data: Dict) -> User:
         """Create a new user with password hashing"""
         try:
             # Hash password before storing
             if 'password' in data:
-                data['password'] = generate_password_hash(data['password'])
+                data['password'] = generate_password_hash(
+                    data['password'],
+                    method=current_app.config['PASSWORD_HASH_METHOD']
+                )
             
             return self.create(data)
         except SQLAlchemyError as e:
@@ -32,37 +41,31 @@ class UserService(BaseService):
         try:
             user = User.query.filter_by(email=email).first()
             if user and check_password_hash(user.password, password):
-                user.last_seen = datetime.utcnow()
-                db.session.commit()
+                self.update_last_seen(user.user_id)
                 return user
             return None
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error authenticating user: {str(e)}")
             raise
     
-    def search_users(self, query: str, page: int = 1, per_page: int = 10) -> Dict:
+    def search_users(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 10,
+        count: bool = False
+    ) -> Dict:
         """Search users by name or email"""
         try:
             search = f"%{query}%"
-            pagination = User.query.filter(
+            search_query = User.query.filter(
                 or_(
                     User.first_name.ilike(search),
                     User.last_name.ilike(search),
                     User.email.ilike(search)
                 )
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
+            ).order_by(User.user_id)
+            return self._paginate(search_query, page, per_page, count)
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error searching users: {str(e)}")
             raise
@@ -72,7 +75,10 @@ class UserService(BaseService):
         try:
             user = self.get_by_id(user_id)
             if user and check_password_hash(user.password, old_password):
-                user.password = generate_password_hash(new_password)
+                user.password = generate_password_hash(
+                    new_password,
+                    method=current_app.config['PASSWORD_HASH_METHOD']
+                )
                 db.session.commit()
                 return True
             return False
@@ -82,14 +88,23 @@ class UserService(BaseService):
             raise
     
     def update_last_seen(self, user_id: int) -> bool:
-        """Update user's last seen timestamp"""
+        """Update user's last seen timestamp; False if there is no user with this id"""
         try:
-            user = self.get_by_id(user_id)
-            if user:
-                user.last_seen = datetime.utcnow()
-                db.session.commit()
+            # Activity within the interval shares the first one's write; the key is only
+            # set once a row was updated, so unknown ids keep returning False
+            seen_key = f"{self.cache_prefix}:seen:{user_id}"
+            if cache.get(seen_key):
                 return True
-            return False
+            
+            count = User.query.filter_by(user_id=user_id).update({
+                'last_seen': datetime.utcnow()
+            })
+            
+            db.session.commit()
+            if count == 0:
+                return False
+            cache.set(seen_key, True, timeout=self.last_seen_interval)
+            return True
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error updating last seen: {str(e)}")
@@ -113,7 +128,9 @@ class UserService(BaseService):
             
             from ..models.chat import ChatParticipant
             return [
-                p.chat for p in ChatParticipant.query.filter_by(
+                p.chat for p in ChatParticipant.query.options(
+                    joinedload(ChatParticipant.chat)
+                ).filter_by(
                     user_id=user_id,
                     left_at=None
                 ).all()
@@ -126,30 +143,22 @@ class UserService(BaseService):
         self,
         user_id: int,
         unread_only: bool = False,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 10
     ) -> Dict:
-        """Get user's notifications"""
+        """Get user's notifications, newest first, with cursor pagination"""
         try:
-            query = User.query.get(user_id).notifications
+            query = Notification.query.filter_by(user_id=user_id)
             if unread_only:
                 query = query.filter_by(read=False)
             
-            pagination = query.order_by(
-                User.notifications.created_at.desc()
-            ).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            return self._keyset_paginate(
+                query,
+                Notification.created_at,
+                Notification.notification_id,
+                cursor,
+                per_page
             )
-            
-            return {
-                'items': pagination.items,
-                'total': pagination.total,
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page
-            }
         except SQLAlchemyError as e:
             current_app.logger.error(f"Error getting user notifications: {str(e)}")
             raise
@@ -157,12 +166,14 @@ class UserService(BaseService):
     def deactivate_user(self, user_id: int) -> bool:
         """Deactivate a user account"""
         try:
-            user = self.get_by_id(user_id)
-            if user:
-                user.status = 'inactive'
-                db.session.commit()
-                return True
-            return False
+            count = User.query.filter_by(user_id=user_id).update({
+                'status': 'inactive'
+            })
+            
+            db.session.commit()
+            if count:
+                self._invalidate_cache()
+            return count > 0
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error deactivating user: {str(e)}")
@@ -171,12 +182,14 @@ class UserService(BaseService):
     def reactivate_user(self, user_id: int) -> bool:
         """Reactivate a user account"""
         try:
-            user = self.get_by_id(user_id)
-            if user:
-                user.status = 'active'
-                db.session.commit()
-                return True
-            return False
+            count = User.query.filter_by(user_id=user_id).update({
+                'status': 'active'
+            })
+            
+            db.session.commit()
+            if count:
+                self._invalidate_cache()
+            return count > 0
         except SQLAlchemyError as e:
             db.session.rollback()
             current_app.logger.error(f"Error reactivating user: {str(e)}")
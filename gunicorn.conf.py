@@ -0,0 +1,26 @@
+import multiprocessing
+import os
+
+# Bind address; PORT matches run.py
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded sync workers: handlers spend most of their time waiting on PostgreSQL
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# Each thread holds at most one PostgreSQL connection at a time, so workers x threads is
+# the app's connection ceiling. Split a fixed budget (keep it under max_connections, which
+# defaults to 100) across the workers, never exceeding ProductionConfig's pool_size of 25
+db_connection_budget = int(os.environ.get('DB_CONNECTION_BUDGET', 80))
+threads = int(os.environ.get(
+    'GUNICORN_THREADS',
+    max(1, min(25, db_connection_budget // workers))
+))
+
+# Keep idle client connections open briefly so proxies can reuse them
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
@@ -12,6 +12,10 @@ env = os.environ.get('FLASK_ENV', 'development')
 app = create_app(env)
 
 if __name__ == '__main__':
+    # The built-in server handles one request at a time; production runs under gunicorn
+    if env == 'production':
+        raise SystemExit("Run production with: gunicorn -c gunicorn.conf.py run:app")
+    
     # Get port from environment variable or default to 5000
     port = int(os.environ.get('PORT', 5000))
     
@@ -1,22 +1,42 @@
-from flask import Flask, request, jsonify
+import click
+from flask import Flask, request, jsonify, url_for
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from flask_caching import Cache
+from marshmallow import Schema, ValidationError, fields
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from sqlalchemy import event, insert
 from datetime import datetime
 
 # Initialize the app
 app = Flask(__name__)
+# Schemas already emit fields in declaration order; skip re-sorting keys on every response
+app.json.sort_keys = False
 
 # Setup the Database URI
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///campus_connect.db'  # SQLite for simplicity
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Explicit connection pool; SQLite file databases get a QueuePool, so each request thread
+# checks out its own connection instead of waiting on a single shared one
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
 
 # Initialize the database and marshmallow
 db = SQLAlchemy(app)
 ma = Marshmallow(app)
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 30})
+
+COURSES_CACHE_KEY = 'courses_list'
 
 # --------------------------------- Models -----------------------------------
 
+# 64-bit keys for write-heavy tables; SQLite only autoincrements a plain INTEGER PRIMARY KEY
+BigIntKey = db.BigInteger().with_variant(db.Integer, 'sqlite')
+
 # Course Model (Ensure it is defined before Assignment Model)
 class Course(db.Model):
     course_id = db.Column(db.Integer, primary_key=True)
@@ -24,6 +44,8 @@ class Course(db.Model):
     semester = db.Column(db.String(50))
     date_and_year = db.Column(db.DateTime)
     course_name = db.Column(db.String(255))
+    # Loaded with one SELECT ... IN per batch of courses instead of one query per course
+    assignments = db.relationship('Assignment', back_populates='course', lazy='selectin')
 
 # Assignment Model
 class Assignment(db.Model):
@@ -36,6 +58,11 @@ class Assignment(db.Model):
     total_points = db.Column(db.Integer)
     status = db.Column(db.Boolean)
     created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    course = db.relationship('Course', back_populates='assignments')
+
+    __table_args__ = (
+        db.Index('ix_assignment_course_due', 'course_id', 'due_date'),
+    )
 
 # User Model
 class User(db.Model):
@@ -57,7 +84,7 @@ class Chat(db.Model):
 
 # Message Model
 class Message(db.Model):
-    message_id = db.Column(db.Integer, primary_key=True)
+    message_id = db.Column(BigIntKey, primary_key=True)
     chat_id = db.Column(db.Integer, db.ForeignKey('chat.chat_id'))
     sender_id = db.Column(db.Integer, db.ForeignKey('user.user_id'))
     message_type = db.Column(db.String(20))
@@ -67,6 +94,11 @@ class Message(db.Model):
     delivered_at = db.Column(db.DateTime)
     read_at = db.Column(db.DateTime)
 
+    __table_args__ = (
+        db.Index('ix_message_chat_sent', 'chat_id', 'sent_at'),
+        db.Index('ix_message_sender', 'sender_id'),
+    )
+
 # Media Model
 class Media(db.Model):
     media_id = db.Column(db.Integer, primary_key=True)
@@ -77,14 +109,19 @@ class Media(db.Model):
 
 # Notification Model
 class Notification(db.Model):
-    notification_id = db.Column(db.Integer, primary_key=True)
+    notification_id = db.Column(BigIntKey, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'))
     chat_id = db.Column(db.Integer, db.ForeignKey('chat.chat_id'))
-    message_id = db.Column(db.Integer, db.ForeignKey('message.message_id'))
+    message_id = db.Column(BigIntKey, db.ForeignKey('message.message_id'))
     notification_type = db.Column(db.String(50))
     seen = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_notification_user_seen', 'user_id', 'seen'),
+        db.Index('ix_notification_chat', 'chat_id'),
+    )
+
 # Group Event Model
 class GroupEvent(db.Model):
     event_id = db.Column(db.Integer, primary_key=True)
@@ -169,63 +206,131 @@ notifications_schema = NotificationSchema(many=True)
 group_event_schema = GroupEventSchema()
 group_events_schema = GroupEventSchema(many=True)
 
+# Request payload schemas; built once and reused to validate every POST body
+class CourseCreateSchema(Schema):
+    professor_id = fields.Integer(required=True)
+    semester = fields.String(required=True)
+    date_and_year = fields.DateTime(required=True)
+    course_name = fields.String(required=True)
+
+class AssignmentCreateSchema(Schema):
+    course_id = fields.Integer(required=True)
+    title = fields.String(required=True)
+    description = fields.String(required=True)
+    due_date = fields.DateTime(required=True)
+    max_score = fields.Integer(required=True)
+    total_points = fields.Integer(required=True)
+    status = fields.Boolean(required=True)
+
+course_create_schema = CourseCreateSchema()
+assignment_create_schema = AssignmentCreateSchema()
+
 # --------------------------------- Routes -----------------------------------
 
 # Create a Course
 @app.route('/courses', methods=['POST'])
 def add_course():
     try:
-        professor_id = request.json['professor_id']
-        semester = request.json['semester']
-        date_and_year = datetime.strptime(request.json['date_and_year'], '%Y-%m-%d %H:%M:%S')
-        course_name = request.json['course_name']
-
-        new_course = Course(
-            professor_id=professor_id,
-            semester=semester,
-            date_and_year=date_and_year,
-            course_name=course_name
-        )
+        new_course = Course(**course_create_schema.load(request.json))
         db.session.add(new_course)
         db.session.commit()
+        cache.delete(COURSES_CACHE_KEY)
 
-        return course_schema.jsonify(new_course), 201
+        # No body: the client fetches the course from Location if it needs it
+        return '', 201, {'Location': url_for('get_course', course_id=new_course.course_id)}
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+# List Courses
+@app.route('/courses', methods=['GET'])
+def list_courses():
+    courses = cache.get(COURSES_CACHE_KEY)
+    if courses is None:
+        # Select just the listed columns; plain rows skip ORM instance construction and the schema dump
+        rows = db.session.execute(
+            db.select(Course.course_id, Course.course_name, Course.semester)
+            .order_by(Course.course_id)
+        ).mappings().all()
+        courses = [dict(row) for row in rows]
+        cache.set(COURSES_CACHE_KEY, courses)
+
+    # Clients revalidating with If-None-Match get an empty 304 when nothing changed
+    response = jsonify(courses)
+    response.add_etag()
+    return response.make_conditional(request)
+
+# Get a Course
+@app.route('/courses/<int:course_id>', methods=['GET'])
+def get_course(course_id):
+    course = db.get_or_404(Course, course_id)
+    return course_schema.jsonify(course)
+
 # Create an Assignment
 @app.route('/assignments', methods=['POST'])
 def add_assignment():
     try:
-        course_id = request.json['course_id']
-        title = request.json['title']
-        description = request.json['description']
-        due_date = datetime.strptime(request.json['due_date'], '%Y-%m-%d %H:%M:%S')
-        max_score = request.json['max_score']
-        total_points = request.json['total_points']
-        status = request.json['status']
-        
-        new_assignment = Assignment(
-            course_id=course_id,
-            title=title,
-            description=description,
-            due_date=due_date,
-            max_score=max_score,
-            total_points=total_points,
-            status=status
-        )
+        new_assignment = Assignment(**assignment_create_schema.load(request.json))
         db.session.add(new_assignment)
         db.session.commit()
 
-        return assignment_schema.jsonify(new_assignment), 201
+        return '', 201, {'Location': url_for('get_assignment', assignment_id=new_assignment.assignment_id)}
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+# Get an Assignment
+@app.route('/assignments/<int:assignment_id>', methods=['GET'])
+def get_assignment(assignment_id):
+    assignment = db.get_or_404(Assignment, assignment_id)
+    return assignment_schema.jsonify(assignment)
+
+# Create many Assignments at once
+@app.route('/assignments/bulk', methods=['POST'])
+def add_assignments_bulk():
+    try:
+        rows = assignment_create_schema.load(request.json, many=True)
+
+        # One executemany INSERT ... RETURNING instead of a unit-of-work flush per row
+        new_assignments = db.session.scalars(
+            insert(Assignment).returning(Assignment),
+            rows
+        ).all()
+        db.session.commit()
+
+        return assignments_schema.jsonify(new_assignments), 201
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
 # --------------------------------- Main Program -----------------------------------
 
-# Ensure app context is available when creating tables
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets reads run alongside a write and commits fsync far less than the rollback journal
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.close()
+
 with app.app_context():
+    # Register before the first connection so every pooled connection is tuned
+    event.listen(db.engine, 'connect', _sqlite_pragmas)
+
+# Create the tables once per deploy (`flask --app app initdb`) rather than in every worker at import
+@app.cli.command('initdb')
+def initdb():
     db.create_all()  # Creates the tables in the database
+    click.echo("Initialized the database")
 
 if __name__ == '__main__':
+    # The dev server is a single process, so creating tables here is still convenient
+    with app.app_context():
+        db.create_all()
     app.run(debug=True)
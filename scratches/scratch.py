@@ -4,27 +4,41 @@ pip install pyjwt
 pip install flask-jwt-extended
 pip install gunicorn eventlet
 
+# Patch blocking I/O before pymongo/openai load so one eventlet worker can multiplex
+# Socket.IO clients and HTTP requests; run with: gunicorn -k eventlet -w 1 -b 0.0.0.0:5000 scratch:app
+import eventlet
+eventlet.monkey_patch()
+
 from flask import Flask, request, jsonify
 from flask_socketio import SocketIO, emit
 from pymongo import MongoClient
-import openai
+from openai import OpenAI
 import jwt
 import datetime
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 
 # Initialize the Flask app and set up configurations
 app = Flask(__name__)
-socketio = SocketIO(app, cors_allowed_origins="*")  # Added CORS support for SocketIO
+app.json.sort_keys = False  # No per-response key sort
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')  # Added CORS support for SocketIO
 app.config['SECRET_KEY'] = 'your-secret-key'
-jwt = JWTManager(app)
+jwt_manager = JWTManager(app)  # Not `jwt`: that name is the PyJWT module login() signs with
+
+# Token signing settings, fixed at startup
+JWT_ALGORITHM = 'HS256'
+TOKEN_LIFETIME = datetime.timedelta(hours=1)
 
-# Initialize OpenAI for chatbot (replace with your actual OpenAI API key)
-openai.api_key = "your-openai-api-key"
+# Initialize OpenAI for chatbot (replace with your actual OpenAI API key); one client is
+# shared so its HTTP connection pool is reused across requests
+openai_client = OpenAI(api_key="your-openai-api-key")
 
 # Initialize MongoDB client (replace with your MongoDB URI if needed)
 client = MongoClient("mongodb://localhost:27017/")
 db = client["schoolApp"]
 
+# GET /attendance filters on date; create_index is a no-op when the index already exists
+db.attendance.create_index([("date", 1)])
+
 
 # Route to check if the app is running
 @app.route('/')
@@ -49,8 +63,8 @@ def login():
         token = jwt.encode({
             'username': username,
             'role': role,
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)
-        }, app.config['SECRET_KEY'], algorithm='HS256')
+            'exp': datetime.datetime.now(datetime.timezone.utc) + TOKEN_LIFETIME
+        }, app.config['SECRET_KEY'], algorithm=JWT_ALGORITHM)
 
         return jsonify({"token": token})
 
@@ -93,8 +107,8 @@ def get_attendance():
         return jsonify({"message": "Unauthorized"}), 403
 
     date = request.args.get('date')  # Get date from query parameters
-    attendance_records = db.attendance.find({"date": date})
-    attendance_list = [record for record in attendance_records]
+    # Leave out _id: ObjectId is not JSON serializable and the client never needs it
+    attendance_list = list(db.attendance.find({"date": date}, {"_id": 0}))
 
     return jsonify(attendance_list)
 
@@ -118,13 +132,13 @@ def chatbot():
     user_input = request.json['user_input']
 
     # Use OpenAI API to generate a response
-    response = openai.Completion.create(
-        engine="text-davinci-003",
-        prompt=user_input,
+    response = openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": user_input}],
         max_tokens=150
     )
 
-    answer = response.choices[0].text.strip()
+    answer = response.choices[0].message.content.strip()
     return jsonify({"answer": answer})
 
 
@@ -140,13 +154,13 @@ def generate_notes():
     content = request.json['content']
 
     # Use GPT-3 to generate notes or summaries
-    response = openai.Completion.create(
-        engine="text-davinci-003",
-        prompt=f"Generate notes for the following content:\n{content}",
+    response = openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": f"Generate notes for the following content:\n{content}"}],
         max_tokens=300
     )
 
-    notes = response.choices[0].text.strip()
+    notes = response.choices[0].message.content.strip()
     return jsonify({"notes": notes})
 
 
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import IntegrityError
+
+from app import cache
+from app.models import db
+from app.models.course import Course
+from app.models.user import User
+from app.services.base_service import BaseService
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Minimal app with SQLite and SimpleCache bound to the shared extensions"""
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}",
+        CACHE_TYPE='SimpleCache',
+    )
+    db.init_app(app)
+    cache.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def service(app):
+    return BaseService(Course)
+
+
+def _course_data():
+    return {
+        'professor_id': 1,
+        'semester': 'Fall',
+        'date_and_year': datetime(2024, 9, 1),
+        'course_name': 'Databases',
+    }
+
+
+def test_create_commits_and_bumps_cache_version(service):
+    course = service.create(_course_data())
+
+    assert course.course_id is not None
+    assert db.session.get(Course, course.course_id) is not None
+    assert cache.get(service.cache_version_key) == 1
+
+
+def test_update_and_delete_bump_cache_version(service):
+    course = service.create(_course_data())
+
+    updated = service.update(course.course_id, {'course_name': 'Distributed Systems'})
+    assert updated.course_name == 'Distributed Systems'
+    assert cache.get(service.cache_version_key) == 2
+
+    assert service.delete(course.course_id) is True
+    assert db.session.get(Course, course.course_id) is None
+    assert cache.get(service.cache_version_key) == 3
+
+
+def test_cache_keys_change_after_write(service):
+    before = service._get_cache_key(['all'])
+    service.create(_course_data())
+
+    assert service._get_cache_key(['all']) != before
+
+
+def test_get_or_create_returns_existing_row(app):
+    users = BaseService(User)
+    defaults = {'first_name': 'Ada', 'last_name': 'Lovelace'}
+
+    first, created = users.get_or_create(email='ada@example.com', defaults=defaults)
+    again, created_again = users.get_or_create(email='ada@example.com', defaults=defaults)
+
+    assert created is True
+    assert created_again is False
+    assert again.user_id == first.user_id
+
+
+def test_get_or_create_surfaces_conflicts_outside_the_lookup(app):
+    users = BaseService(User)
+    users.get_or_create(
+        email='ada@example.com',
+        defaults={'first_name': 'Ada', 'last_name': 'Lovelace', 'phone_number': '555'}
+    )
+
+    with pytest.raises(IntegrityError):
+        users.get_or_create(
+            email='grace@example.com',
+            defaults={'first_name': 'Grace', 'last_name': 'Hopper', 'phone_number': '555'}
+        )